@@ -1,16 +1,22 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from streamlit_option_menu import option_menu
 import json
 import os
+import tempfile
 from datetime import datetime
 import base64
-from extractor.parse_resume import get_resume_text
-from extractor.ai_extractor import extract_resume_data
-from utils.report_generator import generate_pdf_report
-from utils.linkedin_scraper import fetch_linkedin_profile_data
+from extractor.pipeline import analyze_resume, analysis_cache
+from extractor.ai_extractor import FIELDS, get_llm_cache, invalidate_llm_cache
+from extractor.compaction import compaction_stats
+from extractor.schema import repair_stats
+from extractor.router import routing_stats
+from extractor.dedup import get_dedup_index
+from utils.reports import REPORT_FORMATS, get_report, report_cache, unbuffered_file, write_reports_zip
+from extractor.worker_pool import get_parser_pool
+from extractor.parse_resume import UnsupportedFormatError
+
+# pandas, plotly, reportlab and bs4 are imported inside the pages that use them,
+# so a cold start only pays for what the first page needs.
 
 # Page configuration
 st.set_page_config(
@@ -72,6 +78,8 @@ if 'resume_data' not in st.session_state:
     st.session_state.resume_data = None
 if 'analysis_history' not in st.session_state:
     st.session_state.analysis_history = []
+if 'analyzed_upload' not in st.session_state:
+    st.session_state.analyzed_upload = None
 
 def main():
     # Sidebar navigation
@@ -160,39 +168,60 @@ def resume_analysis_page():
     if uploaded_file:
         with st.spinner("🔄 Processing your resume..."):
             try:
-                # Extract text from resume
-                resume_text = get_resume_text(uploaded_file)
-
                 # Progress bar
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                status_text.text("Extracting text from resume...")
-                progress_bar.progress(25)
+                status_text.text("Extracting text and analyzing with AI...")
+                progress_bar.progress(10)
+                preview = st.empty()
+                partial = {}
                 
-                status_text.text("Analyzing with AI...")
-                progress_bar.progress(50)
+                def show_fast_fields(fields):
+                    # Contact details from the rule-based pass, shown while the LLM works
+                    partial.update(fields)
+                    status_text.text("Analyzing with AI...")
+                    progress_bar.progress(20)
+                    with preview.container():
+                        display_resume_results(partial, pending=True)
                 
-                # Extract data using AI
-                raw_json = extract_resume_data(resume_text)
-                data = json.loads(raw_json)
+                def show_field(field, value):
+                    # Each field is drawn as soon as the model has finished writing it
+                    partial[field] = value
+                    received = sum(1 for f in FIELDS if f in partial)
+                    progress_bar.progress(20 + 70 * received // len(FIELDS))
+                    with preview.container():
+                        display_resume_results(partial, pending=True)
+                
+                # Text extraction + AI extraction, memoized on the file contents
+                upload_key, data, cached = analyze_resume(
+                    uploaded_file, on_fast_fields=show_fast_fields, on_field=show_field
+                )
+                preview.empty()
 
-                progress_bar.progress(75)
+                progress_bar.progress(95)
                 status_text.text("Processing results...")
                 
-                # Store in session state
+                # Store in session state; reruns with the same file don't add history rows
                 st.session_state.resume_data = data
-                st.session_state.analysis_history.append({
-                    "timestamp": datetime.now(),
-                    "name": data.get("Name", "Unknown"),
-                    "filename": uploaded_file.name
-                })
+                if st.session_state.analyzed_upload != upload_key:
+                    st.session_state.analyzed_upload = upload_key
+                    st.session_state.analysis_history.append({
+                        "timestamp": datetime.now(),
+                        "name": data.get("Name", "Unknown"),
+                        "filename": uploaded_file.name
+                    })
                 
                 progress_bar.progress(100)
                 status_text.text("Analysis complete!")
                 
-                st.success("✅ Resume analyzed successfully!")
+                if cached:
+                    st.success("✅ Resume analyzed successfully! (cached result)")
+                else:
+                    st.success("✅ Resume analyzed successfully!")
                 
+            except UnsupportedFormatError as e:
+                st.error(f"❌ Unsupported file: {str(e)}")
             except Exception as e:
                 st.error(f"❌ Error analyzing resume: {str(e)}")
     
@@ -219,44 +248,11 @@ def resume_analysis_page():
         else:
             st.info("📊 No previous analyses available for comparison. Analyze more resumes to enable this feature.")
 
-def display_resume_results(data):
+def display_resume_results(data, pending=False):
     st.markdown("## 📋 Analysis Results")
     
     # Key metrics
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown(f"""
-        <div class="metric-card">
-            <h3>👤 Name</h3>
-            <p style="font-size: 1.2rem; font-weight: bold;">{data.get('Name', 'N/A')}</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(f"""
-        <div class="metric-card">
-            <h3>📧 Email</h3>
-            <p style="font-size: 1.2rem; font-weight: bold;">{data.get('Email', 'N/A')}</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(f"""
-        <div class="metric-card">
-            <h3>📞 Phone</h3>
-            <p style="font-size: 1.2rem; font-weight: bold;">{data.get('Phone', 'N/A')}</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        skills_count = len(data.get('Skills', [])) if isinstance(data.get('Skills'), list) else 0
-        st.markdown(f"""
-        <div class="metric-card">
-            <h3>🛠️ Skills</h3>
-            <p style="font-size: 1.2rem; font-weight: bold;">{skills_count}</p>
-        </div>
-        """, unsafe_allow_html=True)
+    display_metric_cards(data, pending=pending)
     
     # Detailed sections
     col1, col2 = st.columns(2)
@@ -335,6 +331,47 @@ def display_resume_results(data):
                 st.write(projects)
             st.markdown('</div>', unsafe_allow_html=True)
 
+def display_metric_cards(data, pending=False):
+    # pending=True while only the rule-based fields are known and the LLM is still running
+    placeholder = "…" if pending else "N/A"
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>👤 Name</h3>
+            <p style="font-size: 1.2rem; font-weight: bold;">{data.get('Name', placeholder)}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>📧 Email</h3>
+            <p style="font-size: 1.2rem; font-weight: bold;">{data.get('Email', placeholder)}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>📞 Phone</h3>
+            <p style="font-size: 1.2rem; font-weight: bold;">{data.get('Phone', placeholder)}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col4:
+        if pending and 'Skills' not in data:
+            skills_count = "…"
+        else:
+            skills_count = len(data.get('Skills', [])) if isinstance(data.get('Skills'), list) else 0
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>🛠️ Skills</h3>
+            <p style="font-size: 1.2rem; font-weight: bold;">{skills_count}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
 def analytics_dashboard_page():
     st.markdown('<div class="main-header"><h1>📊 Analytics Dashboard</h1><p>Comprehensive insights and statistics</p></div>', unsafe_allow_html=True)
     
@@ -342,6 +379,9 @@ def analytics_dashboard_page():
         st.info("📊 No analysis data available. Please analyze a resume first.")
         return
     
+    import pandas as pd
+    import plotly.express as px
+    
     # Convert history to DataFrame
     df = pd.DataFrame(st.session_state.analysis_history)
     df['date'] = pd.to_datetime(df['timestamp']).dt.date
@@ -410,6 +450,9 @@ def skills_analysis_page():
         st.info("📈 No resume data available. Please analyze a resume first.")
         return
     
+    import plotly.express as px
+    import plotly.graph_objects as go
+    
     data = st.session_state.resume_data
     
     # Skills visualization
@@ -509,6 +552,7 @@ def report_generator_page():
     
     if not st.session_state.resume_data:
         st.info("📋 No resume data available. Please analyze a resume first.")
+        batch_reports_section()
         return
     
     data = st.session_state.resume_data
@@ -538,74 +582,99 @@ def report_generator_page():
     if st.button("🚀 Generate Report", type="primary"):
         with st.spinner("Generating report..."):
             try:
-                if report_format == "PDF":
-                    filename = f"{data.get('Name', 'resume')}_{report_type.lower().replace(' ', '_')}_report.pdf"
-                    filepath = generate_pdf_report(data, filename)
-                    
-                    with open(filepath, "rb") as f:
-                        st.download_button(
-                            label="📥 Download PDF Report",
-                            data=f.read(),
-                            file_name=filename,
-                            mime="application/pdf"
-                        )
-                
-                elif report_format == "HTML":
-                    # Generate HTML report
-                    html_content = generate_html_report(data, report_type, include_charts, include_recommendations)
-                    filename = f"{data.get('Name', 'resume')}_{report_type.lower().replace(' ', '_')}_report.html"
-                    
-                    st.download_button(
-                        label="📥 Download HTML Report",
-                        data=html_content,
-                        file_name=filename,
-                        mime="text/html"
-                    )
-                
-                elif report_format == "JSON":
-                    # Generate JSON report
-                    json_content = json.dumps(data, indent=2)
-                    filename = f"{data.get('Name', 'resume')}_{report_type.lower().replace(' ', '_')}_report.json"
-                    
+                # Rendered in memory (no shared reports/ directory) and reused while data and options match
+                report, cached = get_report(data, report_format, report_type, include_charts, include_recommendations)
+                try:
                     st.download_button(
-                        label="📥 Download JSON Report",
-                        data=json_content,
-                        file_name=filename,
-                        mime="application/json"
+                        label=f"📥 Download {report_format} Report",
+                        data=report.content,
+                        file_name=report.filename,
+                        mime=report.mime
                     )
+                finally:
+                    if not isinstance(report.content, bytes):  # spooled to a temp file; the button has read it
+                        report.content.close()
                 
-                st.success("✅ Report generated successfully!")
+                if cached:
+                    st.success("✅ Report generated successfully! (cached)")
+                else:
+                    st.success("✅ Report generated successfully!")
                 
             except Exception as e:
                 st.error(f"❌ Error generating report: {str(e)}")
 
-def generate_html_report(data, report_type, include_charts, include_recommendations):
-    # This would generate a comprehensive HTML report
-    # For now, return a simple HTML structure
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>{report_type} - {data.get('Name', 'Resume')}</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 40px; }}
-            h1 {{ color: #667eea; }}
-            .section {{ margin: 20px 0; }}
-            .skill-tag {{ background: #e3f2fd; color: #1976d2; padding: 5px 10px; border-radius: 15px; margin: 2px; display: inline-block; }}
-        </style>
-    </head>
-    <body>
-        <h1>{report_type}</h1>
-        <div class="section">
-            <h2>Candidate Information</h2>
-            <p><strong>Name:</strong> {data.get('Name', 'N/A')}</p>
-            <p><strong>Email:</strong> {data.get('Email', 'N/A')}</p>
-            <p><strong>Phone:</strong> {data.get('Phone', 'N/A')}</p>
-        </div>
-    </body>
-    </html>
-    """
-    return html
+    batch_reports_section(report_type, include_charts, include_recommendations)
+
+def load_candidates(files):
+    """Candidate dicts from uploaded JSON files, each holding one candidate or a list of them."""
+    candidates, skipped = [], []
+    for file in files:
+        try:
+            content = json.load(file)
+        except ValueError:
+            skipped.append(file.name)
+            continue
+        for item in content if isinstance(content, list) else [content]:
+            if isinstance(item, dict):
+                candidates.append(item)
+            else:
+                skipped.append(file.name)
+    return candidates, skipped
+
+def batch_reports_section(report_type="Comprehensive Analysis", include_charts=True, include_recommendations=True):
+    st.markdown("## 📦 Batch Reports")
+    st.write("Render reports for a whole shortlist into one ZIP. Upload analyzed candidates as JSON "
+             "(the JSON report export, or a list of candidates per file).")
+    
+    files = st.file_uploader("Analyzed candidates", type=["json"], accept_multiple_files=True, key="batch_candidates")
+    col1, col2 = st.columns(2)
+    with col1:
+        batch_formats = st.multiselect("Formats", list(REPORT_FORMATS), default=["PDF"], key="batch_formats")
+    with col2:
+        include_current = st.checkbox("Include current analysis", value=bool(st.session_state.resume_data),
+                                      disabled=not st.session_state.resume_data, key="batch_include_current")
+    
+    if st.button("📦 Generate Report Pack", disabled=not batch_formats):
+        candidates, skipped = load_candidates(files or [])
+        if include_current and st.session_state.resume_data:
+            candidates.insert(0, st.session_state.resume_data)
+        if skipped:
+            st.warning(f"Skipped files that don't hold analyzed candidates: {', '.join(sorted(set(skipped)))}")
+        if not candidates:
+            st.info("📋 No candidates to report on.")
+            return
+        
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        
+        def show_progress(done, total):
+            progress_bar.progress(done / total)
+            status_text.text(f"Rendered {done}/{total} reports")
+        
+        # Rendered across all cores and written into the archive as each report finishes;
+        # the archive lives in an anonymous temp file, not in memory
+        archive = tempfile.TemporaryFile()
+        try:
+            failed = [result for result in write_reports_zip(candidates, archive, batch_formats, report_type,
+                                                              include_charts, include_recommendations,
+                                                              on_progress=show_progress) if result.error]
+            archive = unbuffered_file(archive)
+            st.download_button(
+                label=f"📥 Download Report Pack ({len(candidates)} candidates)",
+                data=archive,
+                file_name=f"report_pack_{datetime.now():%Y%m%d_%H%M}.zip",
+                mime="application/zip"
+            )
+        except Exception as e:
+            st.error(f"❌ Error generating reports: {str(e)}")
+            return
+        finally:
+            archive.close()  # st.download_button has read it by now
+        
+        if failed:
+            st.warning(f"⚠️ {len(failed)} report(s) failed; see errors.txt in the archive.")
+        else:
+            st.success("✅ Report pack generated successfully!")
 
 def settings_page():
     st.markdown('<div class="main-header"><h1>⚙️ Settings</h1><p>Configure your analysis preferences</p></div>', unsafe_allow_html=True)
@@ -640,6 +709,88 @@ def settings_page():
             st.session_state.analysis_history = []
             st.success("Analysis history cleared!")
     
+    st.subheader("⚡ Cache Statistics")
+    
+    stats = analysis_cache.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Cached Analyses", f"{stats['entries']}/{stats['max_entries']}")
+    col2.metric("Cache Hits", stats['hits'])
+    col3.metric("Cache Misses", stats['misses'])
+    col4.metric("Hit Rate", f"{stats['hit_rate'] * 100:.1f}%")
+    
+    if st.button("🧹 Clear Analysis Cache", type="secondary"):
+        analysis_cache.clear()
+        # Otherwise a cleared analysis would come straight back from the near-duplicate index
+        dedup_index = get_dedup_index()
+        if dedup_index is not None:
+            dedup_index.clear()
+        st.success("Analysis cache cleared!")
+    
+    report_stats = report_cache.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Cached Reports", report_stats['entries'])
+    col2.metric("Report Cache Size", f"{report_stats['bytes'] / 1024:.0f}/{report_stats['max_bytes'] / 1024:.0f} KB")
+    col3.metric("Report Hits/Misses", f"{report_stats['hits']}/{report_stats['misses']}")
+    col4.metric("Report Hit Rate", f"{report_stats['hit_rate'] * 100:.1f}%")
+    
+    if st.button("🧹 Clear Report Cache", type="secondary"):
+        report_cache.clear()
+        st.success("Report cache cleared!")
+    
+    llm_cache = get_llm_cache()
+    if llm_cache is not None:
+        llm_stats = llm_cache.stats()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Stored LLM Responses", llm_stats['entries'])
+        col2.metric("LLM Cache Size", f"{llm_stats['bytes'] / 1024:.0f} KB")
+        col3.metric("LLM Cache Hits/Misses", f"{llm_stats['hits']}/{llm_stats['misses']}")
+        
+        if st.button("♻️ Drop Responses From Old Prompts", type="secondary"):
+            removed = invalidate_llm_cache()
+            st.success(f"Removed {removed} stale cached responses and extractions.")
+    
+    prompt_stats = compaction_stats()
+    if prompt_stats['requests']:
+        st.caption(
+            f"Prompt compaction: {prompt_stats['tokens_before']:,} → {prompt_stats['tokens_after']:,} tokens "
+            f"over {prompt_stats['requests']} prompts ({prompt_stats['reduction'] * 100:.1f}% saved, "
+            f"{prompt_stats['cut_to_budget']} cut to the token budget)"
+        )
+    
+    json_stats = repair_stats()
+    if json_stats['replies']:
+        st.caption(
+            f"Model replies: {json_stats['replies']} parsed, {json_stats['repaired']} repaired locally "
+            f"({json_stats['repair_rate'] * 100:.1f}%), {json_stats['failed']} unrecoverable"
+        )
+    
+    route_stats = routing_stats()
+    if route_stats['documents']:
+        routes = ", ".join(
+            f"{model}: {route['calls']} calls, p50 {route['p50']:.1f}s, ${route['cost']:.3f}"
+            for model, route in route_stats['routes'].items()
+        )
+        st.caption(
+            f"Model routing: {route_stats['escalated_documents']}/{route_stats['documents']} resumes escalated "
+            f"({route_stats['escalation_rate'] * 100:.1f}%, {route_stats['escalated_fields']} fields) — {routes}"
+        )
+    
+    dedup_index = get_dedup_index()
+    if dedup_index is not None:
+        dedup_stats = dedup_index.stats()
+        st.caption(
+            f"Near-duplicate index: {dedup_stats['documents']} resumes, {dedup_stats['reused']} reused as-is, "
+            f"{dedup_stats['partial']} partly re-extracted"
+        )
+    
+    parser_pool = get_parser_pool()
+    if parser_pool is not None:
+        pool_stats = parser_pool.stats()
+        st.caption(
+            f"Parser workers: {pool_stats['workers']} running, {pool_stats['documents']} documents parsed, "
+            f"{pool_stats['recycled']} recycled, {pool_stats['timeouts']} timed out, {pool_stats['crashes']} crashed"
+        )
+    
     st.subheader("🎨 UI Preferences")
     
     theme = st.selectbox("Theme", ["Light", "Dark", "Auto"])
@@ -731,6 +882,8 @@ def fetch_linkedin_data(linkedin_url):
     Fetch LinkedIn profile data from URL using the LinkedIn scraper
     """
     try:
+        from utils.linkedin_scraper import fetch_linkedin_profile_data
+        
         # Use the LinkedIn scraper to fetch data
         profile_data = fetch_linkedin_profile_data(linkedin_url)
         return profile_data
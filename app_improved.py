@@ -9,7 +9,8 @@ from datetime import datetime
 import base64
 from extractor.parse_resume import get_resume_text
 from extractor.ai_extractor import extract_resume_data
-from utils.report_generator import generate_pdf_report
+from extractor.schema import parse_resume_json
+from utils.reports import render_report
 
 # Page configuration
 st.set_page_config(
@@ -170,7 +171,7 @@ def resume_analysis_page():
                 
                 # Extract data using AI
                 raw_json = extract_resume_data(resume_text)
-                data = json.loads(raw_json)
+                data = parse_resume_json(raw_json)
                 
                 progress_bar.progress(75)
                 status_text.text("Processing results...")
@@ -508,27 +509,23 @@ def report_generator_page():
         with st.spinner("Generating report..."):
             try:
                 if report_format == "PDF":
-                    filename = f"{data.get('Name', 'resume')}_{report_type.lower().replace(' ', '_')}_report.pdf"
-                    filepath = generate_pdf_report(data, filename)
-                    
-                    with open(filepath, "rb") as f:
-                        st.download_button(
-                            label="📥 Download PDF Report",
-                            data=f.read(),
-                            file_name=filename,
-                            mime="application/pdf"
-                        )
+                    report = render_report(data, "PDF", report_type)
+                    st.download_button(
+                        label="📥 Download PDF Report",
+                        data=report.content,
+                        file_name=report.filename,
+                        mime=report.mime
+                    )
                 
                 elif report_format == "HTML":
-                    # Generate HTML report
-                    html_content = generate_html_report(data, report_type, include_charts, include_recommendations)
-                    filename = f"{data.get('Name', 'resume')}_{report_type.lower().replace(' ', '_')}_report.html"
+                    # Rendered from templates/report_template.html with every value escaped
+                    report = render_report(data, "HTML", report_type, include_charts, include_recommendations)
                     
                     st.download_button(
                         label="📥 Download HTML Report",
-                        data=html_content,
-                        file_name=filename,
-                        mime="text/html"
+                        data=report.content,
+                        file_name=report.filename,
+                        mime=report.mime
                     )
                 
                 elif report_format == "JSON":
@@ -558,34 +555,6 @@ def report_generator_page():
     elif report_type == "Career Overview":
         display_career_preview(data)
 
-def generate_html_report(data, report_type, include_charts, include_recommendations):
-    # This would generate a comprehensive HTML report
-    # For now, return a simple HTML structure
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>{report_type} - {data.get('Name', 'Resume')}</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 40px; }}
-            h1 {{ color: #667eea; }}
-            .section {{ margin: 20px 0; }}
-            .skill-tag {{ background: #e3f2fd; color: #1976d2; padding: 5px 10px; border-radius: 15px; margin: 2px; display: inline-block; }}
-        </style>
-    </head>
-    <body>
-        <h1>{report_type}</h1>
-        <div class="section">
-            <h2>Candidate Information</h2>
-            <p><strong>Name:</strong> {data.get('Name', 'N/A')}</p>
-            <p><strong>Email:</strong> {data.get('Email', 'N/A')}</p>
-            <p><strong>Phone:</strong> {data.get('Phone', 'N/A')}</p>
-        </div>
-    </body>
-    </html>
-    """
-    return html
-
 def display_comprehensive_preview(data):
     st.markdown("### 📊 Comprehensive Analysis Preview")
     st.json(data)
@@ -0,0 +1,73 @@
+"""
+Throughput and limiter behavior of the async batch extractor, fully offline.
+
+    python -m benchmarks.bench_async_batch --docs 200 --in-flight 16 --rpm 600 --error-rate 0.05
+    python -m benchmarks.bench_async_batch --fields Skills   # projected, skills-only screening run
+
+Starts benchmarks.fake_openai_server on a free port, runs aextract_many()
+against it (LLM cache disabled) and reports docs/sec, retries, the peak
+concurrency and requests/min the server saw, and latency percentiles.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+
+from benchmarks.fake_openai_server import start_server  # noqa: E402
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0.0
+
+
+async def _run(args, base_url):
+    from extractor.async_batch import aextract_many, make_client
+
+    texts = [f"Resume {i}\nJane Doe\njane{i}@example.com\nSkills: Python, SQL\n" * 20 for i in range(args.docs)]
+    client = make_client(base_url=base_url, api_key="sk-fake")
+    results = []
+    async for result in aextract_many(texts, client=client, max_in_flight=args.in_flight,
+                                      rpm=args.rpm, tpm=args.tpm, use_cache=False, fields=args.fields):
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100)
+    parser.add_argument("--in-flight", type=int, default=8)
+    parser.add_argument("--rpm", type=float, default=3000)
+    parser.add_argument("--tpm", type=float, default=10_000_000)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--fields", type=lambda value: value.split(","), default=None,
+                        help="comma-separated fields to extract (default: all)")
+    parser.add_argument("--server-rpm", type=int, default=None, help="make the fake server enforce its own limit")
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency, error_rate=args.error_rate, rpm=args.server_rpm)
+    start = time.perf_counter()
+    results = asyncio.run(_run(args, server.base_url))
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    ok = [r for r in results if r.error is None]
+    latencies = [r.seconds for r in ok]
+    stats = server.stats()
+    print(f"docs: {len(results)}  ok: {len(ok)}  failed: {len(results) - len(ok)}")
+    print(f"elapsed: {elapsed:.2f}s  throughput: {len(results) / elapsed:.1f} docs/sec")
+    print(f"retries: {sum(r.attempts - 1 for r in results)}  server errors injected: {stats['errors']}  "
+          f"server 429s: {stats['rate_limited']}")
+    print(f"peak in-flight at server: {stats['max_in_flight']} (limit {args.in_flight})  "
+          f"peak requests/min at server: {stats['max_rpm_seen']} (limit {args.rpm:.0f})")
+    print(f"latency p50: {_percentile(latencies, 50):.2f}s  p95: {_percentile(latencies, 95):.2f}s  "
+          f"max: {max(latencies, default=0):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Batch report packs: reports/second against the number of worker processes.
+
+    python -m benchmarks.bench_batch_reports [--candidates 200] [--workers 1,2,4] [--formats PDF]
+
+Renders a report per synthetic candidate with write_reports_zip() into a
+ZIP in a temporary file, once per worker count, and prints the time, the
+archive size and the parent process's peak Python memory (which stays
+flat as the pack grows, since reports go to the archive as they finish).
+The report cache is cleared before each run so every report is rendered.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_report import sample_data  # noqa: E402
+
+
+def candidates(count):
+    for i in range(count):
+        data = sample_data(entries=5 + i % 20)
+        data["Name"] = f"Candidate {i}"
+        yield data
+
+
+def main():
+    from utils.reports import report_cache, write_reports_zip
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--workers", default=f"1,{os.cpu_count() or 1}")
+    parser.add_argument("--formats", default="PDF")
+    args = parser.parse_args()
+
+    formats = args.formats.split(",")
+    print(f"{os.cpu_count()} CPUs, {args.candidates} candidates, formats {', '.join(formats)}")
+    print(f"{'workers':>7} {'seconds':>8} {'reports/s':>10} {'zip MB':>7} {'peak MB':>8} {'failed':>6}")
+    for workers in (int(n) for n in args.workers.split(",")):
+        report_cache.clear()
+        with tempfile.TemporaryFile() as archive:
+            tracemalloc.start()
+            start = time.perf_counter()
+            results = list(write_reports_zip(candidates(args.candidates), archive, formats, max_workers=workers))
+            seconds = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            size = archive.tell()
+            archive.seek(0)
+            with zipfile.ZipFile(archive) as zf:
+                assert len(zf.namelist()) >= len(results)
+        failed = sum(1 for result in results if result.error)
+        print(f"{workers:7d} {seconds:8.2f} {len(results) / seconds:10.1f} {size / 1e6:7.1f} "
+              f"{peak / 1e6:8.1f} {failed:6d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Extraction latency against resume length: one prompt vs section chunks.
+
+    python -m benchmarks.bench_chunking [--sizes 1,2,4,8,16] [--chunk-tokens 3000] [--tps 40]
+
+Synthetic resumes grow by repeating their experience, project and
+publication entries. Each size is extracted with chunking disabled (one
+prompt) and enabled, offline against the fake provider, whose reply time
+grows with the number of tokens it writes, like a real model. The LLM
+cache is off so every run pays for its calls.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def long_resume(scale):
+    jobs = "\n".join(
+        f"- Research Engineer {k}, Lab {k % 7}, 20{10 + k % 10}: built data pipeline number {k} in Python and Spark"
+        for k in range(6 * scale)
+    )
+    projects = "\n".join(f"- Project {k}: distributed system for workload {k}" for k in range(4 * scale))
+    papers = "\n".join(f"- Paper {k}: On scalable methods, Journal {k % 5}, 20{10 + k % 10}" for k in range(8 * scale))
+    return (
+        "Asha Rao\nasha.rao@example.com\n+1 555 010 0000\n\n"
+        "Summary\nResearch engineer working on data systems.\n\n"
+        "Education\n- PhD Computer Science, State University, 2016\n\n"
+        "Skills\n- Python\n- Spark\n- SQL\n- Kubernetes\n\n"
+        f"Work Experience\n{jobs}\n\nProjects\n{projects}\n\nPublications\n{papers}\n"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1,2,4,8,16")
+    parser.add_argument("--chunk-tokens", type=int, default=3000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--tps", type=float, default=40.0, help="fake provider tokens/second")
+    args = parser.parse_args()
+
+    os.environ.setdefault("RESUME_LLM_PROVIDER", "fake")
+    os.environ["RESUME_FAKE_LATENCY"] = str(args.latency)
+    os.environ["RESUME_FAKE_TOKENS_PER_SEC"] = str(args.tps)
+    os.environ["RESUME_LLM_CACHE"] = "0"
+    os.environ["RESUME_COMPACT"] = "0"  # keep the one-prompt run from being cut to the token budget
+
+    from extractor.chunking import extract_chunked, split_sections
+    from extractor.compaction import count_tokens
+
+    print(f"{'tokens':>8} {'chunks':>7} {'one prompt':>11} {'chunked':>9} {'items':>12}")
+    for scale in (int(s) for s in args.sizes.split(",")):
+        text = long_resume(scale)
+        timings, items = {}, {}
+        for label, max_tokens in (("single", 10 ** 9), ("chunked", args.chunk_tokens)):
+            start = time.perf_counter()
+            data = extract_chunked(text, max_tokens=max_tokens, max_workers=args.workers)
+            timings[label] = time.perf_counter() - start
+            items[label] = sum(len(v) for v in data.values() if isinstance(v, list))
+        chunks = len(split_sections(text, args.chunk_tokens))
+        print(f"{count_tokens(text):8d} {chunks:7d} {timings['single']:10.2f}s {timings['chunked']:8.2f}s "
+              f"{items['single']:5d}/{items['chunked']:<5d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Prompt-token reduction from compaction, and its effect on extraction.
+
+    python -m benchmarks.bench_compaction path/to/resumes [--budget 6000] [--extract 50]
+
+Text is pulled from every PDF/DOCX/TXT under the directory (process pool),
+then compacted. Reports prompt tokens before/after and compaction cost.
+With --extract N, the first N resumes are also sent to the configured model
+both verbatim and compacted, and the script reports end-to-end latency and
+field-level agreement between the two (the LLM cache is bypassed).
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["RESUME_LLM_CACHE"] = "0"
+
+
+def _normalize(value):
+    if isinstance(value, list):
+        return sorted(json.dumps(_normalize(v), sort_keys=True) for v in value)
+    if isinstance(value, dict):
+        return {str(k).lower(): _normalize(v) for k, v in value.items()}
+    return " ".join(str(value).lower().split()) if value is not None else ""
+
+
+def _loads(raw):
+    try:
+        return json.loads(raw)
+    except ValueError:
+        start, end = raw.find("{"), raw.rfind("}")
+        return json.loads(raw[start:end + 1]) if start != -1 and end > start else {}
+
+
+def main():
+    from extractor.compaction import compact_text, tokenizer_name
+    from extractor.parse_resume import extract_texts, iter_dir_sources
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus")
+    parser.add_argument("--budget", type=int, default=int(os.getenv("RESUME_PROMPT_TOKEN_BUDGET", "6000")))
+    parser.add_argument("--extract", type=int, default=0, metavar="N")
+    args = parser.parse_args()
+
+    texts = [r.text for r in extract_texts(iter_dir_sources(args.corpus)) if r.text]
+    if not texts:
+        sys.exit(f"No readable resumes in {args.corpus}")
+
+    before, after, cut, seconds = [], [], 0, []
+    compacted_texts = []
+    for text in texts:
+        start = time.perf_counter()
+        compacted, stats = compact_text(text, args.budget)
+        seconds.append(time.perf_counter() - start)
+        compacted_texts.append(compacted)
+        before.append(stats.tokens_before)
+        after.append(stats.tokens_after)
+        cut += bool(stats.dropped_sections or stats.trimmed_sections)
+
+    total_before, total_after = sum(before), sum(after)
+    print(f"resumes: {len(texts)}  token budget: {args.budget}")
+    print(f"prompt tokens: {total_before:,} -> {total_after:,} "
+          f"({(1 - total_after / total_before) * 100:.1f}% fewer; "
+          f"median per resume {statistics.median(before):.0f} -> {statistics.median(after):.0f})")
+    print(f"cut to budget: {cut}  compaction cost: {statistics.mean(seconds) * 1000:.2f} ms/resume "
+          f"(tokenizer: {tokenizer_name()})")
+
+    if not args.extract:
+        return
+
+    from extractor.ai_extractor import FIELDS, extract_resume_data
+
+    agree = {field: 0 for field in FIELDS}
+    latency = {"verbatim": [], "compacted": []}
+    n = min(args.extract, len(texts))
+    for text in texts[:n]:
+        results = {}
+        for mode, compact in (("verbatim", False), ("compacted", True)):
+            start = time.perf_counter()
+            results[mode] = _loads(extract_resume_data(text, compact=compact))
+            latency[mode].append(time.perf_counter() - start)
+        for field in FIELDS:
+            if _normalize(results["verbatim"].get(field)) == _normalize(results["compacted"].get(field)):
+                agree[field] += 1
+
+    print(f"\nextraction on {n} resumes")
+    for mode, values in latency.items():
+        print(f"  {mode:<10} mean {statistics.mean(values):.2f}s  p50 {statistics.median(values):.2f}s")
+    print("  field agreement (compacted vs verbatim):")
+    for field, count in agree.items():
+        print(f"    {field:<32} {count / n * 100:5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Near-duplicate index: query latency at scale, and signature cost.
+
+    python -m benchmarks.bench_dedup [--docs 200000] [--queries 1000]
+
+Fills a throwaway index with --docs random MinHash signatures, then queries
+it with near-duplicates of indexed documents (a few signature values
+changed) and with unrelated ones, and reports lookup latency percentiles
+and the hit rate. Also times signature() on a typical resume.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main():
+    from extractor.dedup import NUM_PERM, NearDuplicateIndex, signature
+    from benchmarks.bench_chunking import long_resume
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--changed", type=int, default=8, help="signature values changed per near-duplicate")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    index = NearDuplicateIndex(os.path.join(tempfile.mkdtemp(prefix="bench_dedup_"), "index.sqlite3"),
+                               max_documents=args.docs)
+    signatures = []
+    start = time.perf_counter()
+    for i in range(args.docs):
+        sig = array("I", (rng.getrandbits(32) for _ in range(NUM_PERM)))
+        signatures.append(sig)
+        index.add(f"resume {i}", {"Name": f"Candidate {i}"}, sig=sig)
+    print(f"indexed {args.docs:,} documents in {time.perf_counter() - start:.1f}s "
+          f"({os.path.getsize(index.path) / 1e6:.1f} MB)")
+
+    for label, near in (("near-duplicate", True), ("unrelated", False)):
+        seconds, hits = [], 0
+        for q in range(args.queries):
+            if near:
+                sig = array("I", signatures[rng.randrange(len(signatures))])
+                for pos in rng.sample(range(NUM_PERM), args.changed):
+                    sig[pos] = rng.getrandbits(32)
+            else:
+                sig = array("I", (rng.getrandbits(32) for _ in range(NUM_PERM)))
+            start = time.perf_counter()
+            match = index.query(f"query {q}", sig=sig)
+            seconds.append(time.perf_counter() - start)
+            hits += match is not None
+        print(f"{label:<15} p50 {statistics.median(seconds) * 1000:.3f} ms  p99 {_percentile(seconds, 99) * 1000:.3f} ms"
+              f"  matched {hits}/{args.queries}")
+
+    text = long_resume(2)
+    start = time.perf_counter()
+    for _ in range(20):
+        signature(text)
+    print(f"signature() on a {len(text):,}-char resume: {(time.perf_counter() - start) / 20 * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Compare DOCX text backends: documents/sec and peak RSS.
+
+    python -m benchmarks.bench_docx [corpus_dir] [--backends native docx2txt] [--repeat 3]
+
+Without a corpus, a synthetic set is generated: resumes of increasing length,
+each carrying an embedded image of --image-mb megabytes, to show that memory
+stays flat regardless of media size.
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Default Extension="png" ContentType="image/png"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+_RELS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def _synthetic_docx(path, paragraphs, image_mb):
+    body = []
+    for i in range(paragraphs):
+        body.append(f"<w:p><w:r><w:t>Line {i}: Built data pipelines in Python and SQL for analytics.</w:t></w:r></w:p>")
+        if i % 20 == 0:
+            body.append(
+                "<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Skill</w:t></w:r></w:p></w:tc>"
+                "<w:tc><w:p><w:r><w:t>Python</w:t></w:r></w:p></w:tc></w:tr></w:tbl>"
+            )
+    document = f'<?xml version="1.0" encoding="UTF-8"?><w:document {_NS}><w:body>{"".join(body)}</w:body></w:document>'
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _RELS)
+        zf.writestr("word/document.xml", document)
+        zf.writestr("word/header1.xml", f'<w:hdr {_NS}><w:p><w:r><w:t>Jane Doe - Resume</w:t></w:r></w:p></w:hdr>')
+        # Incompressible bytes so the image really is image_mb inside the archive
+        zf.writestr("word/media/image1.png", os.urandom(int(image_mb * 1024 * 1024)), zipfile.ZIP_STORED)
+
+
+def _max_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+
+def _run_backend(name, paths, repeat, queue):
+    from extractor.parse_resume import get_backend
+
+    extractor = get_backend("docx", name)
+    baseline = _max_rss_mb()
+    start = time.perf_counter()
+    chars = 0
+    for _ in range(repeat):
+        for path in paths:
+            with open(path, "rb") as f:
+                chars += len("\n".join(extractor(f)))
+    queue.put({"seconds": time.perf_counter() - start, "chars": chars,
+               "peak_rss_mb": _max_rss_mb(), "baseline_rss_mb": baseline})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", nargs="?", help="directory of .docx files (searched recursively)")
+    parser.add_argument("--backends", nargs="+", default=["native", "docx2txt"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--image-mb", type=float, default=20.0, help="embedded image size for the synthetic corpus")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.corpus:
+            paths = sorted(glob.glob(os.path.join(args.corpus, "**", "*.docx"), recursive=True))
+        else:
+            paths = []
+            for paragraphs in (50, 500, 5000):
+                path = os.path.join(tmp, f"synthetic_{paragraphs}.docx")
+                _synthetic_docx(path, paragraphs, args.image_mb)
+                paths.append(path)
+        if not paths:
+            sys.exit(f"No .docx files found in {args.corpus}")
+
+        docs = len(paths) * args.repeat
+        print(f"{len(paths)} files (x{args.repeat})")
+        print(f"{'backend':<10} {'docs/sec':>9} {'seconds':>9} {'peak RSS MB':>12} {'delta MB':>9} {'chars':>10}")
+        ctx = multiprocessing.get_context("spawn")
+        for name in args.backends:
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_run_backend, args=(name, paths, args.repeat, queue))
+            proc.start()
+            result = queue.get()
+            proc.join()
+            print(
+                f"{name:<10} {docs / result['seconds']:>9.1f} {result['seconds']:>9.2f} "
+                f"{result['peak_rss_mb']:>12.1f} {result['peak_rss_mb'] - result['baseline_rss_mb']:>9.1f} "
+                f"{result['chars']:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Template reports: reports/second for HTML, WeasyPrint PDF and reportlab PDF.
+
+    python -m benchmarks.bench_html_report [--reports 50] [--entries 1,10,40]
+
+Renders the sample resume from bench_report with the Jinja2 template
+(HTML), the template printed by WeasyPrint (PDF, sharing one parsed
+stylesheet and font configuration) and the reportlab renderer (PDF). The
+first render of each is timed separately: it includes compiling the
+template (or loading it from the bytecode cache) and parsing the CSS.
+WeasyPrint is skipped when it or its system libraries aren't installed.
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_report import sample_data  # noqa: E402
+
+
+def main():
+    from utils.html_report import render_html_report, render_weasyprint_report
+    from utils.report_generator import render_pdf_report
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=50)
+    parser.add_argument("--entries", default="1,10,40")
+    args = parser.parse_args()
+
+    def weasyprint_pdf(data):
+        buffer = io.BytesIO()
+        render_weasyprint_report(data, buffer)
+        return buffer.getvalue()
+
+    def reportlab_pdf(data):
+        buffer = io.BytesIO()
+        render_pdf_report(data, buffer)
+        return buffer.getvalue()
+
+    renderers = [("html", lambda data: render_html_report(data).encode("utf-8"))]
+    try:
+        import weasyprint  # noqa: F401
+        renderers.append(("weasyprint", weasyprint_pdf))
+    except (ImportError, OSError) as e:  # OSError: pango/cairo libraries missing
+        print(f"weasyprint skipped: {type(e).__name__}: {str(e).splitlines()[0]}")
+    renderers.append(("reportlab", reportlab_pdf))
+
+    print(f"{'entries':>7} {'renderer':<10} {'first ms':>9} {'ms/report':>10} {'reports/s':>10} {'bytes':>9}")
+    first = set()
+    for entries in (int(n) for n in args.entries.split(",")):
+        data = sample_data(entries)
+        for label, render in renderers:
+            start = time.perf_counter()
+            content = render(data)
+            first_ms = (time.perf_counter() - start) * 1000 if label not in first else None
+            first.add(label)
+            seconds = []
+            for _ in range(args.reports):
+                start = time.perf_counter()
+                content = render(data)
+                seconds.append(time.perf_counter() - start)
+            median = statistics.median(seconds)
+            first_column = f"{first_ms:9.1f}" if first_ms is not None else f"{'':9}"
+            print(f"{entries:7d} {label:<10} {first_column} {median * 1000:10.2f} {1 / median:10.1f} {len(content):9,d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Cold-start import cost of the app and its page-specific dependencies.
+
+    python -m benchmarks.bench_import_time [--repeat 5] [--budget app=1500 extractor.pipeline=150]
+
+Each module is imported in a fresh interpreter with `-X importtime`; the
+median cumulative time is reported along with the slowest transitive
+imports. With --budget, exits non-zero when a module goes over its
+millisecond budget, so CI can catch a heavy import creeping back to the
+top of app.py.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What every cold start pays, then what each page pays the first time it opens
+DEFAULT_MODULES = [
+    "app",
+    "extractor.pipeline",
+    "extractor.ai_extractor",
+    "pandas",               # Analytics Dashboard
+    "plotly.express",       # Analytics Dashboard, Skills Analysis
+    "utils.report_generator",  # Report Generator (reportlab)
+    "utils.linkedin_scraper",  # LinkedIn Analyzer (bs4, requests)
+    "langchain.chat_models",   # first LLM call
+]
+
+
+def _import_profile(module):
+    """Return ({module: cumulative_us}, total_us) for one cold import."""
+    env = dict(os.environ, STREAMLIT_BROWSER_GATHER_USAGE_STATS="false")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        last = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "unknown error"
+        raise RuntimeError(f"import {module} failed: {last}")
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:  self_us |  cumulative_us | <indent>module"
+        _, cumulative_us, name = line.split("|", 2)
+        timings[name.strip()] = int(cumulative_us)
+    return timings, timings.get(module, max(timings.values(), default=0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="slowest transitive imports to list per module")
+    parser.add_argument("--budget", nargs="*", default=[], metavar="MODULE=MS")
+    args = parser.parse_args()
+
+    budgets = {k: float(v) for k, v in (item.split("=", 1) for item in args.budget)}
+    over_budget = []
+    for module in args.modules:
+        try:
+            runs = [_import_profile(module) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{module:<28} skipped ({e})")
+            continue
+        median_ms = statistics.median(total for _, total in runs) / 1000
+        budget = budgets.get(module)
+        flag = ""
+        if budget is not None:
+            flag = "  OK" if median_ms <= budget else f"  OVER BUDGET ({budget:.0f} ms)"
+            if median_ms > budget:
+                over_budget.append(module)
+        print(f"{module:<28} {median_ms:>8.1f} ms{flag}")
+
+        timings = runs[-1][0]
+        top_level = {name: us for name, us in timings.items() if name != module and "." not in name}
+        for name, us in sorted(top_level.items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"    {name:<24} {us / 1000:>8.1f} ms")
+
+    if over_budget:
+        sys.exit(f"Import budget exceeded: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
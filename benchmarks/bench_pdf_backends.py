@@ -0,0 +1,85 @@
+"""
+Compare PDF text backends on the same corpus: pages/sec and peak RSS.
+
+    python -m benchmarks.bench_pdf_backends path/to/pdfs [--backends pymupdf pdfplumber] [--repeat 3]
+
+Each backend runs in a fresh process so peak RSS isn't polluted by the others.
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _page_count(path):
+    try:
+        import fitz
+        with fitz.open(path) as doc:
+            return doc.page_count
+    except ImportError:
+        import pdfplumber
+        with pdfplumber.open(path) as pdf:
+            return len(pdf.pages)
+
+
+def _max_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+
+def _run_backend(name, paths, repeat, queue):
+    from extractor.parse_resume import get_backend
+
+    extractor = get_backend("pdf", name)
+    baseline = _max_rss_mb()
+    start = time.perf_counter()
+    chars = 0
+    for _ in range(repeat):
+        for path in paths:
+            with open(path, "rb") as f:
+                chars += len("\n".join(extractor(f)))
+    elapsed = time.perf_counter() - start
+    queue.put({"seconds": elapsed, "chars": chars, "peak_rss_mb": _max_rss_mb(), "baseline_rss_mb": baseline})
+
+
+def main():
+    from extractor.parse_resume import BACKENDS
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", help="directory of PDFs (searched recursively) or a single PDF")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS["pdf"]))
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    if os.path.isdir(args.corpus):
+        paths = sorted(glob.glob(os.path.join(args.corpus, "**", "*.pdf"), recursive=True))
+    else:
+        paths = [args.corpus]
+    if not paths:
+        sys.exit(f"No PDFs found in {args.corpus}")
+    pages = sum(_page_count(p) for p in paths) * args.repeat
+
+    print(f"{len(paths)} files, {pages} pages (x{args.repeat})")
+    print(f"{'backend':<12} {'pages/sec':>10} {'seconds':>9} {'peak RSS MB':>12} {'delta MB':>9} {'chars':>10}")
+    ctx = multiprocessing.get_context("spawn")
+    for name in args.backends:
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_run_backend, args=(name, paths, args.repeat, queue))
+        proc.start()
+        result = queue.get()
+        proc.join()
+        print(
+            f"{name:<12} {pages / result['seconds']:>10.1f} {result['seconds']:>9.2f} "
+            f"{result['peak_rss_mb']:>12.1f} {result['peak_rss_mb'] - result['baseline_rss_mb']:>9.1f} "
+            f"{result['chars']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
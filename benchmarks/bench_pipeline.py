@@ -0,0 +1,115 @@
+"""
+End-to-end extraction throughput, cache effectiveness and time-to-first-field,
+offline, against the fake (or a replay) LLM provider.
+
+    python -m benchmarks.bench_pipeline [--resumes 50] [--threads 8] [--latency 0.5] [--tps 40]
+    RESUME_LLM_PROVIDER=replay python -m benchmarks.bench_pipeline path/to/resumes
+
+Resumes come from a directory (PDF/DOCX/TXT) or are generated. Each one is
+extracted cold, then again warm from the LLM cache (a throwaway SQLite file),
+and once more streamed to measure how soon the first field reaches the UI.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+NAMES = ["Asha Rao", "Ben Carter", "Chen Li", "Diego Ruiz", "Ela Novak", "Farah Khan", "Gus Moreau"]
+SKILLS = ["Python", "SQL", "Docker", "React", "AWS", "Pandas", "Kubernetes", "Go", "TypeScript", "Spark"]
+
+
+def synthetic_resume(i):
+    skills = "\n".join(f"- {SKILLS[(i + k) % len(SKILLS)]}" for k in range(5))
+    jobs = "\n".join(f"- Engineer at Company {i}-{k}, 20{10 + k}-20{11 + k}" for k in range(3))
+    return (
+        f"{NAMES[i % len(NAMES)]}\ncandidate{i}@example.com\n+1 555 010 {i:04d}\n\n"
+        f"Education\n- B.Tech Computer Science, State University, 2018, CGPA 8.{i % 10}\n\n"
+        f"Skills\n{skills}\n\nWork Experience\n{jobs}\n\n"
+        f"Projects\n- Project {i}: a data pipeline\n\nCertifications\n- Cloud Practitioner\n"
+    )
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def _report(label, seconds, wall):
+    print(f"{label:<8} {len(seconds) / wall:7.1f} resumes/s   p50 {statistics.median(seconds) * 1000:7.1f} ms"
+          f"   max {max(seconds) * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", nargs="?")
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--tps", type=float, default=40.0, help="fake provider tokens/second")
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    os.environ.setdefault("RESUME_LLM_PROVIDER", "fake")
+    os.environ["RESUME_FAKE_LATENCY"] = str(args.latency)
+    os.environ["RESUME_FAKE_TOKENS_PER_SEC"] = str(args.tps)
+    os.environ["RESUME_LLM_CACHE_PATH"] = os.path.join(cache_dir, "llm_cache.sqlite3")
+    # Cold/warm and streaming timings are about LLM calls and their cache, not near-duplicate
+    # reuse (see bench_dedup), which would otherwise answer every warm or repeated run
+    os.environ["RESUME_DEDUP"] = "0"
+
+    from extractor.ai_extractor import get_llm_cache, get_provider
+    from extractor.pipeline import extract_with_fast_fields
+    from extractor.router import routing_stats
+
+    if args.corpus:
+        from extractor.parse_resume import extract_texts, iter_dir_sources
+
+        texts = [r.text for r in extract_texts(iter_dir_sources(args.corpus)) if r.text][:args.resumes]
+    else:
+        texts = [synthetic_resume(i) for i in range(args.resumes)]
+    if not texts:
+        sys.exit(f"No readable resumes in {args.corpus}")
+
+    provider = get_provider()
+    llm_cache = get_llm_cache()
+    print(f"provider: {provider.name} ({provider.model})  resumes: {len(texts)}  threads: {args.threads}")
+    for label in ("cold", "warm"):
+        with ThreadPoolExecutor(args.threads) as pool:
+            start = time.perf_counter()
+            seconds = list(pool.map(lambda text: _timed(extract_with_fast_fields, text), texts))
+            wall = time.perf_counter() - start
+        _report(label, seconds, wall)
+    if llm_cache is not None:
+        stats = llm_cache.stats()
+        total = stats["hits"] + stats["misses"]
+        print(f"llm cache: {stats['hits']}/{total} hits, {stats['entries']} entries, {stats['bytes']:,} bytes")
+    routes = routing_stats()
+    print(f"routing: {routes['escalated_documents']}/{routes['documents']} escalated")
+    for model, route in routes["routes"].items():
+        print(f"  {model:<24} {route['calls']:4d} calls ({route['cached']} cached)  p50 {route['p50'] * 1000:7.1f} ms"
+              f"  est. ${route['cost']:.4f}")
+
+    # Streaming: how long until the first field could be drawn, versus the whole reply
+    if llm_cache is not None:
+        llm_cache.invalidate()
+    first, full = [], []
+    for text in texts[:min(10, len(texts))]:
+        start = time.perf_counter()
+        times = []
+        extract_with_fast_fields(text, on_field=lambda field, value: times.append(time.perf_counter() - start))
+        full.append(time.perf_counter() - start)
+        if times:
+            first.append(times[0])
+    if first:
+        print(f"stream   first field p50 {statistics.median(first) * 1000:7.1f} ms"
+              f"   complete p50 {statistics.median(full) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
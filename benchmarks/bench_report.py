@@ -0,0 +1,128 @@
+"""
+PDF report rendering: bytes and milliseconds per report.
+
+    python -m benchmarks.bench_report [--reports 50] [--entries 1,10,40]
+
+Renders reports for a sample resume with a growing number of experience
+entries, with the current in-memory render_report() and with the previous
+implementation kept below for comparison (header code per page, a blank
+page per page number, no compression, written to reports/ in a temporary
+directory).
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def sample_data(entries):
+    return {
+        "Name": "Asha Rao",
+        "Email": "asha.rao@example.com",
+        "Phone": "+1 555 010 0000",
+        "Education": [{"Degree": "B.Tech", "Field": "Computer Science", "University": "State University",
+                       "Year": "2018", "CGPA": "8.7"}],
+        "Skills": ["Python", "SQL", "Docker", "React", "AWS", "Pandas", "Kubernetes"],
+        "Projects": [{"Name": f"Project {i}", "Description": "Streaming data pipeline with exactly-once delivery "
+                      "and backfills across several regions"} for i in range(entries // 2 + 1)],
+        "Certifications": ["AWS Cloud Practitioner"],
+        "Internships / Work experience": [
+            {"Position": "Data Engineer", "Company": f"Company {i}", "Duration": "2019-2021",
+             "Description": "Owned ingestion, modelling and reporting for the analytics platform; cut batch "
+                            "latency from hours to minutes by moving to incremental loads"}
+            for i in range(entries)
+        ],
+        "Domain of expertise": "Data engineering",
+    }
+
+
+def legacy_generate_pdf_report(data, filename="report.pdf"):
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    from utils.report_generator import format_value
+
+    os.makedirs("reports", exist_ok=True)
+    filepath = os.path.join("reports", filename)
+    c = canvas.Canvas(filepath, pagesize=A4)
+    width, height = A4
+
+    def header():
+        c.setFont("Helvetica-Bold", 20)
+        c.drawCentredString(width / 2, height - 60, "AI Resume Analysis Report")
+        c.setLineWidth(1)
+        c.setStrokeColor(colors.grey)
+        c.line(50, height - 70, width - 50, height - 70)
+
+    header()
+    y = height - 100
+    page_num = 1
+    for key, value in data.items():
+        if y < 100:
+            c.showPage()
+            page_num += 1
+            header()
+            y = height - 100
+        c.setFont("Helvetica-Bold", 14)
+        c.drawString(50, y, f"{key}:")
+        y -= 22
+        c.setFont("Helvetica", 12)
+        for line in format_value(value).split("\n"):
+            if y < 70:
+                c.showPage()
+                page_num += 1
+                header()
+                y = height - 100
+                c.setFont("Helvetica", 12)
+            c.drawString(70, y, line)
+            y -= 18
+        y -= 10
+    for i in range(page_num):
+        c.showPage()
+        c.setFont("Helvetica", 10)
+        c.drawCentredString(width / 2, 30, f"Page {i+1}")
+    c.save()
+    return filepath
+
+
+def _read(result):
+    if isinstance(result, bytes):
+        return result
+    with open(result, "rb") as f:
+        return f.read()
+
+
+def main():
+    from utils.reports import render_report
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=50)
+    parser.add_argument("--entries", default="1,10,40")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_report_"))
+    print(f"{'entries':>7} {'renderer':<8} {'pages':>5} {'bytes':>9} {'ms/report':>10}")
+    for entries in (int(n) for n in args.entries.split(",")):
+        data = sample_data(entries)
+        renderers = (
+            ("before", lambda i: legacy_generate_pdf_report(data, f"before_{i}.pdf")),
+            ("after", lambda i: render_report(data, "PDF").content),
+        )
+        for label, render in renderers:
+            seconds = []
+            for i in range(args.reports):
+                start = time.perf_counter()
+                result = render(i)
+                seconds.append(time.perf_counter() - start)
+            pdf = _read(result)
+            pages = pdf.count(b"/Type /Page\n")
+            print(f"{entries:7d} {label:<8} {pages:5d} {len(pdf):9,d} "
+                  f"{statistics.median(seconds) * 1000:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Local stand-in for the OpenAI chat-completions endpoint, for offline load tests.
+
+    python -m benchmarks.fake_openai_server --port 8765 --latency 0.5 --error-rate 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 ...
+
+It sleeps `latency` seconds (plus jitter) per request, answers with a fixed
+resume JSON, and fails a fraction of requests with 429/500 to exercise retries.
+With --rpm it also enforces a requests/min limit the way the real API does.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLE_RESPONSE = {
+    "Name": "John Doe",
+    "Email": "john.doe@email.com",
+    "Phone": "+1-555-0123",
+    "Education": [{"Degree": "Bachelor of Science", "Field": "Computer Science", "University": "Tech University", "Year": "2023"}],
+    "Skills": ["Python", "Machine Learning", "SQL"],
+    "Projects": [{"Name": "AI Chatbot", "Description": "Built a chatbot", "Technologies": ["Python"]}],
+    "Certifications": ["AWS Certified Developer"],
+    "Internships / Work experience": [{"Company": "Tech Corp", "Position": "Intern", "Duration": "6 months"}],
+    "Domain of expertise": "Software Development",
+}
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.5, jitter=0.1, error_rate=0.0, rpm=None):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rpm = rpm
+        self.lock = threading.Lock()
+        self.recent = deque()  # request timestamps within the last minute
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.max_in_flight = 0
+        self.in_flight = 0
+        self.max_rpm_seen = 0
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def stats(self):
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "rate_limited": self.rate_limited,
+                "max_in_flight": self.max_in_flight,
+                "max_rpm_seen": self.max_rpm_seen,
+            }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body, headers=None):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self._reply(404, {"error": {"message": "not found"}})
+
+        now = time.monotonic()
+        with server.lock:
+            server.requests += 1
+            while server.recent and now - server.recent[0] > 60:
+                server.recent.popleft()
+            if server.rpm and len(server.recent) >= server.rpm:
+                server.rate_limited += 1
+                return self._reply(429, {"error": {"message": "Rate limit reached", "type": "requests"}},
+                                   {"retry-after": "1"})
+            server.recent.append(now)
+            server.max_rpm_seen = max(server.max_rpm_seen, len(server.recent))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(max(0.0, server.latency + random.uniform(-server.jitter, server.jitter)))
+            if random.random() < server.error_rate:
+                with server.lock:
+                    server.errors += 1
+                status = random.choice((429, 500, 503))
+                return self._reply(status, {"error": {"message": "Injected failure"}})
+
+            content = json.dumps(SAMPLE_RESPONSE)
+            prompt = "".join(m.get("content", "") for m in body.get("messages", []))
+            self._reply(200, {
+                "id": f"chatcmpl-fake-{server.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {
+                    "prompt_tokens": len(prompt) // 4,
+                    "completion_tokens": len(content) // 4,
+                    "total_tokens": (len(prompt) + len(content)) // 4,
+                },
+            })
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+def start_server(host="127.0.0.1", port=0, **kwargs):
+    """Start a fake server on a background thread; port=0 picks a free port."""
+    server = FakeOpenAIServer((host, port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rpm", type=int, default=None)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer((args.host, args.port), latency=args.latency, jitter=args.jitter,
+                              error_rate=args.error_rate, rpm=args.rpm)
+    print(f"Fake chat-completions server on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,222 @@
 import os
+import sqlite3
+import threading
+import warnings
+from typing import NamedTuple
+
 from dotenv import load_dotenv
-from langchain.chat_models import ChatOpenAI
-from langchain.prompts import PromptTemplate
-from langchain.schema import HumanMessage
+
+from extractor.compaction import compact_text, estimate_tokens
+from extractor.dedup import get_dedup_index
+from extractor.json_stream import TopLevelFieldParser
+from extractor.llm_cache import DEFAULT_PATH as LLM_CACHE_PATH, LLMCache, prompt_version
+from extractor.providers import PROVIDER, make_provider
+from extractor.schema import canonical_field, coerce_field, is_usable_reply, parse_resume_json, record_reply
 
 # Load OpenAI key from .env
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY not found in environment. Please check your .env file.")
+MODEL_NAME = "gpt-4"  # Or "gpt-3.5-turbo" if you're on free tier
+
+# Resume text is normalized and cut to this many tokens before it goes in the
+# prompt (gpt-4's 8k context minus the template and room for the JSON reply).
+# RESUME_COMPACT=0 sends the text verbatim.
+PROMPT_TOKEN_BUDGET = int(os.getenv("RESUME_PROMPT_TOKEN_BUDGET", "6000"))
+COMPACT_PROMPTS = os.getenv("RESUME_COMPACT", "1") != "0"
+
+# OpenAI's JSON mode (response_format=json_object) guarantees a parseable
+# reply, but only newer models accept it. RESUME_JSON_MODE=1/0 forces it on/off.
+JSON_MODE_MODELS = ("gpt-4o", "gpt-4-turbo", "gpt-4-1106", "gpt-4-0125", "gpt-3.5-turbo-1106", "gpt-3.5-turbo-0125")
+JSON_MODE = os.getenv("RESUME_JSON_MODE", "auto")
+
+
+def supports_json_mode(model):
+    if JSON_MODE != "auto":
+        return JSON_MODE == "1"
+    return model == "gpt-3.5-turbo" or model.startswith(JSON_MODE_MODELS)
+
+# Providers (and langchain behind them, which is slow to import) are built on
+# first use, so importing this module doesn't pay for it or need the API key.
+_providers = {}
+_provider_lock = threading.Lock()
+
 
-llm = ChatOpenAI(
-    openai_api_key=OPENAI_API_KEY,
-    temperature=0.0,
-    model="gpt-4"  # Or "gpt-3.5-turbo" if you're on free tier
-)
+def get_provider(model=None):
+    """The LLM backend selected by RESUME_LLM_PROVIDER (see extractor.providers) for `model`."""
+    model = model or MODEL_NAME
+    provider = _providers.get(model)
+    if provider is None:
+        with _provider_lock:
+            provider = _providers.get(model)
+            if provider is None:
+                model_kwargs = {}
+                if supports_json_mode(model):
+                    model_kwargs["response_format"] = {"type": "json_object"}
+                provider = _providers[model] = make_provider(PROVIDER, model, OPENAI_API_KEY, model_kwargs)
+    return provider
 
-PROMPT_TEMPLATE = """
+
+def active_model(model=None):
+    """Model name replies are cached under: the model, or the offline provider's stand-in for it."""
+    return get_provider(model).model
+
+# Field name -> how it is described to the model, in prompt order
+FIELD_DESCRIPTIONS = {
+    "Name": "Name",
+    "Email": "Email",
+    "Phone": "Phone",
+    "Education": "Education (schooling, college, degree, year, CGPA)",
+    "Skills": "Skills",
+    "Projects": "Projects",
+    "Certifications": "Certifications",
+    "Internships / Work experience": "Internships / Work experience",
+    "Domain of expertise": "Domain of expertise",
+}
+FIELDS = list(FIELD_DESCRIPTIONS)
+
+
+def build_prompt_template(fields=None):
+    """Prompt template asking only for `fields` (all fields by default)."""
+    fields = [f for f in FIELDS if f in fields] if fields is not None else FIELDS
+    wanted = "\n".join(f"- {FIELD_DESCRIPTIONS[f]}" for f in fields)
+    return f"""
 You are an AI resume analyzer. Extract the following from the given resume:
-- Name
-- Email
-- Phone
-- Education (schooling, college, degree, year, CGPA)
-- Skills
-- Projects
-- Certifications
-- Internships / Work experience
-- Domain of expertise
+{wanted}
 Return your response in clean JSON format.
 Resume text:
-{text}
+{{text}}
 """
 
-def extract_resume_data(text):
-    prompt = PromptTemplate.from_template(PROMPT_TEMPLATE)
-    message = HumanMessage(content=prompt.format(text=text))
-    response = llm([message])
-    return response.content
+
+PROMPT_TEMPLATE = build_prompt_template()
+PROMPT_VERSION = prompt_version(PROMPT_TEMPLATE)
+
+_llm_cache = None
+_llm_cache_opened = False
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """
+    Process-wide LLM response cache, opened on first use. None when
+    RESUME_LLM_CACHE=0 (always call the model) or when the cache file can't
+    be created, e.g. on a read-only filesystem; extraction then runs uncached.
+    """
+    global _llm_cache, _llm_cache_opened
+    if not _llm_cache_opened:
+        with _llm_cache_lock:
+            if not _llm_cache_opened:
+                if os.getenv("RESUME_LLM_CACHE", "1") != "0":
+                    try:
+                        _llm_cache = LLMCache()
+                    except (OSError, sqlite3.Error) as e:
+                        warnings.warn(f"LLM cache disabled, can't open {LLM_CACHE_PATH}: {e}", RuntimeWarning)
+                _llm_cache_opened = True
+    return _llm_cache
+
+
+def invalidate_llm_cache(stale_only=True):
+    """
+    Drop cached responses, and extractions kept for near-duplicate reuse,
+    from older prompt versions (or everything). Returns the number removed.
+    """
+    removed = 0
+    llm_cache = get_llm_cache()
+    if llm_cache is not None:
+        removed += llm_cache.invalidate(keep_version=PROMPT_VERSION) if stale_only else llm_cache.invalidate()
+    index = get_dedup_index()
+    if index is not None:
+        # Index versions are "<PROMPT_VERSION> <model> <routing>", see pipeline.extract_with_fast_fields
+        removed += index.invalidate(f"{PROMPT_VERSION} " if stale_only else None)
+    return removed
+
+
+def prepare_prompt_text(text, compact=None):
+    """Resume text as it goes into the prompt: compacted to the token budget unless disabled."""
+    if not (COMPACT_PROMPTS if compact is None else compact):
+        return text
+    return compact_text(text, PROMPT_TOKEN_BUDGET)[0]
+
+
+class LLMReply(NamedTuple):
+    content: str
+    model: str            # as reported by the provider (see active_model)
+    cached: bool
+    prompt_tokens: int    # estimated
+    completion_tokens: int
+
+
+def _prepare_request(text, fields, compact, model):
+    """Prompt text, prompt version and cache key for one extraction request."""
+    text = prepare_prompt_text(text, compact)
+    template = PROMPT_TEMPLATE if fields is None else build_prompt_template(fields)
+    # Subset prompts are versioned under the full prompt so invalidation covers them too
+    version = PROMPT_VERSION if fields is None else f"{PROMPT_VERSION}/{prompt_version(template)}"
+    llm_cache = get_llm_cache()
+    key = llm_cache.make_key(text, version, active_model(model)) if llm_cache is not None else None
+    return template.format(text=text), version, key
+
+
+def request_resume_data(text, fields=None, compact=None, model=None):
+    """
+    Ask `model` (MODEL_NAME by default) for `fields` (all of FIELDS by
+    default). Returns an LLMReply with the raw JSON text. Replies are cached
+    per (compacted) text, field set and model, unless they can't be parsed
+    (a refusal or garbage), so the next attempt asks the model again.
+    """
+    prompt, version, key = _prepare_request(text, fields, compact, model)
+    provider = get_provider(model)
+    llm_cache = get_llm_cache()
+    content = llm_cache.get(key) if key is not None else None
+    cached = content is not None
+    if not cached:
+        content = provider.complete(prompt)
+        if key is not None and is_usable_reply(content):
+            llm_cache.put(key, content, version, provider.model)
+    return LLMReply(content, provider.model, cached, estimate_tokens(prompt), estimate_tokens(content))
+
+
+def extract_resume_data(text, fields=None, compact=None, model=None):
+    """Like request_resume_data(), but returns just the raw JSON reply."""
+    return request_resume_data(text, fields, compact, model).content
+
+
+def stream_resume_data(text, fields=None, compact=None, model=None, on_reply=None):
+    """
+    Like extract_resume_data(), but streams the reply and yields each
+    top-level (field, value) pair, normalized to the schema, as soon as the
+    model has finished writing it. A cached reply yields all of its fields
+    at once. `on_reply` is called with the LLMReply once the reply is complete.
+    """
+    prompt, version, key = _prepare_request(text, fields, compact, model)
+    provider = get_provider(model)
+    parser = TopLevelFieldParser()
+    llm_cache = get_llm_cache()
+    cached = llm_cache.get(key) if key is not None else None
+    if cached is not None:
+        chunks = [cached]
+    else:
+        chunks = provider.stream(prompt)
+
+    content = []
+    for chunk in chunks:
+        content.append(chunk)
+        for field, value in parser.feed(chunk):
+            field = canonical_field(field)
+            yield field, coerce_field(field, value)
+
+    raw = "".join(content)
+    if not parser.done or parser.skipped:
+        # Fenced oddly, cut off or otherwise malformed: repair the whole reply
+        # locally and yield whatever the incremental parser couldn't
+        streamed = {canonical_field(field) for field in parser.fields}
+        for field, value in parse_resume_json(raw).items():
+            if field not in streamed:
+                yield field, value
+    else:
+        record_reply("parsed")
+    if key is not None and cached is None:
+        llm_cache.put(key, raw, version, provider.model)
+    if on_reply is not None:
+        on_reply(LLMReply(raw, provider.model, cached is not None, estimate_tokens(prompt), estimate_tokens(raw)))
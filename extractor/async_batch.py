@@ -0,0 +1,184 @@
+import asyncio
+import os
+import random
+import time
+from typing import NamedTuple, Optional
+
+from extractor.ai_extractor import (
+    FIELDS, MODEL_NAME, PROMPT_TEMPLATE, PROMPT_VERSION, build_prompt_template, get_llm_cache, prepare_prompt_text,
+    supports_json_mode,
+)
+from extractor.compaction import estimate_tokens
+from extractor.llm_cache import prompt_version
+from extractor.schema import is_usable_reply
+
+MAX_IN_FLIGHT = int(os.getenv("RESUME_LLM_CONCURRENCY", "8"))
+REQUESTS_PER_MINUTE = float(os.getenv("RESUME_LLM_RPM", "500"))
+TOKENS_PER_MINUTE = float(os.getenv("RESUME_LLM_TPM", "40000"))
+MAX_RETRIES = int(os.getenv("RESUME_LLM_MAX_RETRIES", "6"))
+REQUEST_TIMEOUT = float(os.getenv("RESUME_LLM_TIMEOUT", "120"))
+EXPECTED_COMPLETION_TOKENS = 800  # a typical extracted resume JSON
+
+
+class TokenBucket:
+    """
+    Async token bucket for a per-minute quota. A `burst` fraction of the
+    quota is available up front and the rest refills evenly, so no 60-second
+    window ever exceeds `per_minute` (burst + refill over a minute = quota).
+    `acquire(n)` waits until n tokens are available; n above the bucket's
+    capacity is charged in full, waiting until the refill has covered it.
+    """
+
+    def __init__(self, per_minute, burst=0.1):
+        self.capacity = max(1.0, per_minute * burst)
+        self.rate = max(per_minute - self.capacity, 1.0) / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount=1):
+        async with self._lock:
+            while True:
+                self._refill()
+                # A request larger than the whole bucket can't wait for `amount` tokens to be
+                # there at once; it starts on a full bucket and is charged in full below
+                if self.tokens >= min(amount, self.capacity):
+                    self.tokens -= amount
+                    break
+                await asyncio.sleep((min(amount, self.capacity) - self.tokens) / self.rate)
+            if self.tokens < 0:
+                # ...and doesn't go out until the refill has paid off the rest (holding the
+                # lock, so nothing else is let through meanwhile)
+                await asyncio.sleep(-self.tokens / self.rate)
+
+
+class BatchExtraction(NamedTuple):
+    index: int                # position of the text in the input
+    content: Optional[str]    # raw model output (JSON text)
+    error: Optional[str]
+    attempts: int
+    seconds: float
+    cached: bool = False
+
+
+def _is_retryable(exc):
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(exc).__name__ in ("APIConnectionError", "APITimeoutError", "TimeoutError")
+
+
+def _retry_after(exc):
+    response = getattr(exc, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _backoff(attempt, base=1.0, cap=60.0):
+    # "Full jitter": a random wait in [0, min(cap, base * 2^attempt)]
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def make_client(base_url=None, api_key=None, timeout=REQUEST_TIMEOUT):
+    """AsyncOpenAI client without its own retries (we retry here). Honors OPENAI_BASE_URL."""
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(
+        api_key=api_key or os.getenv("OPENAI_API_KEY") or "not-needed-for-local-servers",
+        base_url=base_url or os.getenv("OPENAI_BASE_URL") or None,
+        max_retries=0,
+        timeout=timeout,
+    )
+
+
+async def aextract_many(texts, client=None, model=MODEL_NAME, max_in_flight=MAX_IN_FLIGHT,
+                        rpm=REQUESTS_PER_MINUTE, tpm=TOKENS_PER_MINUTE, max_retries=MAX_RETRIES,
+                        use_cache=True, fields=None):
+    """
+    Extract many resume texts concurrently, yielding a BatchExtraction per
+    text as soon as it finishes. At most `max_in_flight` requests run at once;
+    requests/min and tokens/min are held under `rpm` and `tpm` by token
+    buckets; 429s, 5xx and connection errors are retried with jittered
+    exponential backoff (honoring Retry-After). `fields` limits the prompt
+    (and reply) to those fields, e.g. ["Skills"] for a screening run.
+    """
+    client = client or make_client()
+    request_bucket = TokenBucket(rpm)
+    token_bucket = TokenBucket(tpm)
+    results = asyncio.Queue()
+    inputs = enumerate(texts)
+    cache = get_llm_cache() if use_cache else None
+    template = PROMPT_TEMPLATE if fields is None else build_prompt_template(fields)
+    version = PROMPT_VERSION if fields is None else f"{PROMPT_VERSION}/{prompt_version(template)}"
+    completion_tokens = EXPECTED_COMPLETION_TOKENS * len(fields or FIELDS) // len(FIELDS)
+    extra = {"response_format": {"type": "json_object"}} if supports_json_mode(model) else {}
+
+    async def extract(index, text):
+        start = time.perf_counter()
+        text = prepare_prompt_text(text)
+        key = None
+        if cache is not None:
+            key = cache.make_key(text, version, model)
+            hit = cache.get(key)
+            if hit is not None:
+                return BatchExtraction(index, hit, None, 0, time.perf_counter() - start, True)
+
+        prompt = template.format(text=text)
+        cost = estimate_tokens(prompt) + completion_tokens
+        attempt = 0
+        while True:
+            attempt += 1
+            await request_bucket.acquire(1)
+            await token_bucket.acquire(cost)
+            try:
+                response = await client.chat.completions.create(
+                    model=model,
+                    temperature=0.0,
+                    messages=[{"role": "user", "content": prompt}],
+                    **extra,
+                )
+            except Exception as e:
+                if attempt > max_retries or not _is_retryable(e):
+                    return BatchExtraction(index, None, f"{type(e).__name__}: {e}", attempt,
+                                           time.perf_counter() - start)
+                await asyncio.sleep(_retry_after(e) or _backoff(attempt - 1))
+                continue
+            content = response.choices[0].message.content
+            if key is not None and is_usable_reply(content):  # a refusal mustn't answer every later run
+                cache.put(key, content, version, model)
+            return BatchExtraction(index, content, None, attempt, time.perf_counter() - start)
+
+    async def worker():
+        for index, text in inputs:  # shared iterator: each text is taken by exactly one worker
+            await results.put(await extract(index, text))
+
+    workers = [asyncio.create_task(worker()) for _ in range(max_in_flight)]
+    done = asyncio.gather(*workers)
+    try:
+        while not (done.done() and results.empty()):
+            getter = asyncio.ensure_future(results.get())
+            await asyncio.wait({getter, done}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                yield getter.result()
+            else:
+                getter.cancel()
+        done.result()  # surface unexpected worker crashes
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+def extract_many(texts, **kwargs):
+    """Blocking convenience wrapper: run the async batch and return results in input order."""
+    async def run():
+        return [result async for result in aextract_many(texts, **kwargs)]
+
+    return sorted(asyncio.run(run()), key=lambda r: r.index)
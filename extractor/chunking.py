@@ -0,0 +1,122 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from extractor.ai_extractor import FIELDS
+from extractor.compaction import count_tokens, normalize_text
+from extractor.fast_extract import detect_sections
+from extractor.router import extract_routed
+from extractor.schema import LIST_FIELDS
+
+# Resumes longer than this (after normalization) are split on section
+# boundaries and the chunks extracted concurrently, then merged.
+CHUNK_TOKENS = int(os.getenv("RESUME_CHUNK_TOKENS", "3000"))
+CHUNK_WORKERS = int(os.getenv("RESUME_CHUNK_WORKERS", "4"))
+
+
+def _split_lines(heading, body, max_tokens):
+    """Cut one oversized section into pieces on line boundaries, repeating the heading."""
+    pieces, lines, used = [], [], count_tokens(heading) + 1
+    for line in body.split("\n"):
+        cost = count_tokens(line) + 1
+        if lines and used + cost > max_tokens:
+            pieces.append("\n".join([heading] + lines if heading else lines))
+            lines, used = [], count_tokens(heading) + 1
+        lines.append(line)
+        used += cost
+    if lines:
+        pieces.append("\n".join([heading] + lines if heading else lines))
+    return pieces
+
+
+def split_sections(text, max_tokens=CHUNK_TOKENS):
+    """
+    Split resume text into chunks of whole sections of at most `max_tokens`
+    each (an oversized section is cut on line boundaries). The first chunk
+    starts with the header, so contact details stay together.
+    """
+    chunks, current, used = [], [], 0
+    for section in detect_sections(text):
+        body = text[section.start:section.end].strip()
+        block = f"{section.heading}\n{body}" if section.heading else body
+        cost = count_tokens(block) + 1
+        if cost > max_tokens:
+            pieces = _split_lines(section.heading, body, max_tokens)
+        else:
+            pieces = [block]
+        for piece in pieces:
+            cost = count_tokens(piece) + 1
+            if current and used + cost > max_tokens:
+                chunks.append("\n".join(current))
+                current, used = [], 0
+            current.append(piece)
+            used += cost
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _dedup_key(item):
+    if isinstance(item, str):
+        return " ".join(item.lower().split())
+    return json.dumps(item, sort_keys=True, default=str).lower()
+
+
+def merge_partials(partials, fields=None):
+    """
+    Merge per-chunk results in chunk order: scalars take the first non-empty
+    value, lists are concatenated with duplicates (ignoring case and
+    whitespace) removed. The result doesn't depend on completion order.
+    """
+    merged = {}
+    seen = {}
+    for partial in partials:
+        for field, value in partial.items():
+            if fields is not None and field not in fields:
+                continue
+            if field in LIST_FIELDS or isinstance(value, list):
+                items = merged.setdefault(field, [])
+                keys = seen.setdefault(field, set())
+                for item in value if isinstance(value, list) else [value]:
+                    key = _dedup_key(item)
+                    if key and key not in keys:
+                        keys.add(key)
+                        items.append(item)
+            elif not merged.get(field):
+                merged[field] = value
+    return merged
+
+
+def extract_chunked(text, fields=None, on_field=None, max_tokens=CHUNK_TOKENS, max_workers=CHUNK_WORKERS):
+    """
+    Extract `fields` (all of FIELDS by default) from `text`. Short resumes
+    take one extract_routed() call; longer ones are split on section
+    boundaries, the chunks extracted concurrently (contact and other single
+    value fields only from the first chunk) and the results merged.
+    `on_field(field, value)` is called with the merged value of a field
+    each time a finished chunk changes it.
+    """
+    wanted = list(fields) if fields is not None else FIELDS
+    chunks = split_sections(normalize_text(text), max_tokens) if count_tokens(text) > max_tokens else [text]
+    if len(chunks) == 1:
+        return extract_routed(text, fields, on_field=on_field)
+
+    list_fields = [field for field in wanted if field in LIST_FIELDS]
+    jobs = [(0, chunks[0], fields)]
+    if list_fields:
+        jobs += [(i, chunk, list_fields) for i, chunk in enumerate(chunks[1:], 1)]
+
+    partials = {}
+    reported = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+        futures = {pool.submit(extract_routed, chunk, chunk_fields): i for i, chunk, chunk_fields in jobs}
+        for future in as_completed(futures):
+            partials[futures[future]] = future.result()
+            if on_field is None:
+                continue
+            merged = merge_partials([partials[i] for i in sorted(partials)], wanted)
+            for field, value in merged.items():
+                if reported.get(field) != value:
+                    reported[field] = value
+                    on_field(field, value)
+    return merge_partials([partials[i] for i in sorted(partials)], wanted)
@@ -0,0 +1,233 @@
+import re
+import threading
+from collections import Counter
+from typing import NamedTuple
+
+from extractor.fast_extract import EMAIL_RE, PHONE_RE, URL_RE, detect_sections
+
+# What survives first when a resume has to be cut to fit the budget
+SECTION_PRIORITY = [
+    "Header",
+    "Internships / Work experience",
+    "Skills",
+    "Education",
+    "Projects",
+    "Certifications",
+    "Summary",
+    "Achievements",
+    "Publications",
+]
+
+_HYPHEN_BREAK_RE = re.compile(r"(\w)-\n(?=[a-z])")
+_PAGE_NUMBER_RE = re.compile(
+    r"^\s*(?:-\s*)?(?P<label>page\s*)?(?P<n>\d{1,3})(?:\s*(?:of|/)\s*(?P<total>\d{1,3}))?(?:\s*-)?\s*$", re.I
+)
+# Unlabelled page numbers in a sequence are at least this many lines apart (table cells aren't)
+MIN_PAGE_LINES = 10
+_BOILERPLATE_RE = re.compile(
+    r"^\s*(?:curriculum vitae|resume|résumé|cv|references (?:are )?available (?:up)?on request\.?)\s*$", re.I
+)
+_BULLET_RE = re.compile(r"^[ \t]*[•●▪■◆◦►➢✓✔·*]+[ \t]*", re.M)
+_INLINE_SPACE_RE = re.compile(r"[ \t ]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_RUNNING_HEADER_HINT_RE = re.compile(r"\bpage\b|confidential|curriculum vitae|\bresume\b", re.I)
+
+_encoder = None
+_encoder_loaded = False
+
+
+def estimate_tokens(text):
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+def _get_encoder():
+    global _encoder, _encoder_loaded
+    if not _encoder_loaded:
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding("cl100k_base")
+        except ImportError:
+            _encoder = None
+        _encoder_loaded = True
+    return _encoder
+
+
+def tokenizer_name():
+    return "tiktoken" if _get_encoder() is not None else "estimate"
+
+
+def count_tokens(text):
+    """Exact count with tiktoken when it's installed, otherwise an estimate."""
+    encoder = _get_encoder()
+    return len(encoder.encode(text)) if encoder is not None else estimate_tokens(text)
+
+
+class CompactionStats(NamedTuple):
+    tokens_before: int
+    tokens_after: int
+    dropped_sections: tuple    # sections left out entirely to meet the budget
+    trimmed_sections: tuple    # sections cut short to meet the budget
+
+
+def _page_number_lines(lines, boundary):
+    """
+    Indices of lines that are page numbers: "Page 3" or "Page 2 of 4"
+    anywhere, a bare number or "n/m" first or last on a page (`boundary`),
+    or bare numbers forming an increasing 1, 2, 3... (or 2, 3...) sequence a
+    page apart. Other number-only lines (table cells, "9/10" ratings) stay.
+    """
+    found = set()
+    run = []
+    for i, line in enumerate(lines):
+        match = _PAGE_NUMBER_RE.match(line)
+        if match is None:
+            continue
+        if match.group("label") or i in boundary:
+            found.add(i)
+            continue
+        n, total = int(match.group("n")), match.group("total")
+        if run and n == run[-1][1] + 1 and total == run[-1][2] and i - run[-1][0] >= MIN_PAGE_LINES:
+            run.append((i, n, total))
+        elif n in (1, 2) and (total is None or int(total) >= 2):
+            if len(run) >= 2:
+                found.update(j for j, _, _ in run)
+            run = [(i, n, total)]
+    if len(run) >= 2:
+        found.update(j for j, _, _ in run)
+    return found
+
+
+def normalize_text(text):
+    """
+    Remove what carries no information for extraction: repeated page
+    headers/footers, page numbers, boilerplate lines, hyphenation splits,
+    bullet glyphs and whitespace runs.
+    """
+    text = text.replace("\r\n", "\n")
+    text = _HYPHEN_BREAK_RE.sub(r"\1", text)
+    text = _BULLET_RE.sub("- ", text)
+
+    lines, boundary = [], set()
+    pages = text.split("\f")  # form feeds, where the extractor kept them, mark page breaks
+    for page in pages:
+        start = len(lines)
+        lines.extend(_INLINE_SPACE_RE.sub(" ", line).strip() for line in page.split("\n"))
+        if len(pages) > 1:
+            filled = [i for i in range(start, len(lines)) if lines[i]]
+            boundary.update(filled[:1] + filled[-1:])
+    page_numbers = _page_number_lines(lines, boundary)
+    # A running header/footer is a short line repeated on 3+ pages that looks like one
+    # (the name line, contact details, "Page"/"Confidential"). Repeated job titles
+    # and the like don't match, so they are kept.
+    first_line = next((line.lower() for line in lines if line), "")
+    counts = Counter(line.lower() for line in lines if line and len(line) < 80)
+    repeated = {
+        line for line, n in counts.items()
+        if n >= 3 and (line == first_line or EMAIL_RE.search(line) or PHONE_RE.search(line)
+                       or URL_RE.search(line) or _RUNNING_HEADER_HINT_RE.search(line))
+    }
+    seen = set()
+    kept = []
+    for i, line in enumerate(lines):
+        if i in page_numbers or _BOILERPLATE_RE.match(line):
+            continue
+        key = line.lower()
+        if key in repeated:
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(line)
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(kept)).strip()
+
+
+def _trim_to_tokens(text, budget):
+    """Keep whole lines from the top of `text` while they fit in `budget` tokens."""
+    kept, used = [], 0
+    for line in text.split("\n"):
+        cost = count_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+
+def compact_text(text, token_budget=None):
+    """
+    Normalize resume text and, if it is still over `token_budget`, keep the
+    highest-value sections (see SECTION_PRIORITY) in full and trim or drop
+    the rest. Sections stay in their original order. Returns (text, stats).
+    """
+    tokens_before = count_tokens(text)
+    compacted = normalize_text(text)
+    dropped, trimmed = [], []
+
+    if token_budget is not None and count_tokens(compacted) > token_budget:
+        sections = detect_sections(compacted)
+        rank = {name: i for i, name in enumerate(SECTION_PRIORITY)}
+        order = sorted(range(len(sections)), key=lambda i: (rank.get(sections[i].name, len(rank)), i))
+        kept = {}
+        remaining = token_budget
+        for i in order:
+            section = sections[i]
+            body = compacted[section.start:section.end].strip()
+            block = f"{section.heading}\n{body}" if section.heading else body
+            cost = count_tokens(block) + 1
+            if cost <= remaining:
+                kept[i] = block
+                remaining -= cost
+                continue
+            partial = _trim_to_tokens(block, remaining) if remaining > 20 else ""
+            if partial.strip() and partial.strip() != section.heading:
+                kept[i] = partial
+                remaining -= count_tokens(partial) + 1
+                trimmed.append(section.name)
+            else:
+                dropped.append(section.name)
+        compacted = "\n".join(kept[i] for i in sorted(kept) if kept[i])
+
+    stats = CompactionStats(tokens_before, count_tokens(compacted), tuple(dropped), tuple(trimmed))
+    _totals.record(stats)
+    return compacted, stats
+
+
+class _CompactionTotals:
+    """
+    Running totals across every compaction in this process, for the Settings
+    page. Counted per prompt, not per resume: a chunked or escalated resume
+    is compacted once for each request it makes (cached ones included).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.cut_to_budget = 0
+
+    def record(self, stats):
+        with self._lock:
+            self.requests += 1
+            self.tokens_before += stats.tokens_before
+            self.tokens_after += stats.tokens_after
+            if stats.dropped_sections or stats.trimmed_sections:
+                self.cut_to_budget += 1
+
+    def stats(self):
+        with self._lock:
+            saved = self.tokens_before - self.tokens_after
+            return {
+                "requests": self.requests,
+                "tokens_before": self.tokens_before,
+                "tokens_after": self.tokens_after,
+                "reduction": saved / self.tokens_before if self.tokens_before else 0.0,
+                "cut_to_budget": self.cut_to_budget,
+            }
+
+
+_totals = _CompactionTotals()
+
+
+def compaction_stats():
+    return _totals.stats()
@@ -0,0 +1,336 @@
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import warnings
+import zlib
+from array import array
+from typing import NamedTuple
+
+from extractor.compaction import normalize_text
+from extractor.fast_extract import EMAIL_RE, PHONE_RE, URL_RE, detect_sections
+from extractor.llm_cache import CACHE_DIR, DEFAULT_TTL
+
+DEFAULT_PATH = os.getenv("RESUME_DEDUP_PATH", os.path.join(CACHE_DIR, "near_duplicates.sqlite3"))
+# Estimated Jaccard similarity of word shingles above which an earlier extraction is reused
+THRESHOLD = float(os.getenv("RESUME_DEDUP_THRESHOLD", "0.85"))
+# Extractions older than the LLM cache TTL are dropped, then the oldest beyond MAX_DOCUMENTS
+TTL = float(os.getenv("RESUME_DEDUP_TTL", str(DEFAULT_TTL)))  # seconds, 0 = never expire
+MAX_DOCUMENTS = int(os.getenv("RESUME_DEDUP_MAX_DOCS", "100000"))
+EVICT_EVERY = 256  # inserts between eviction passes (so the bound is approximate)
+SHINGLE_WORDS = 5
+NUM_PERM = 128
+BANDS = 16          # 16 bands of 8 rows: pairs above ~0.75 similarity almost always share a bucket
+ROWS = NUM_PERM // BANDS
+
+_MERSENNE = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(1)  # fixed seed: signatures must be comparable across runs
+_PERMUTATIONS = [(_rng.randrange(1, 1 << 32), _rng.randrange(0, 1 << 32)) for _ in range(NUM_PERM)]
+_WORD_RE = re.compile(r"\w+")
+
+# Lines at the top of the Header treated as contact details (name, title, contact line)
+HEADER_CONTACT_LINES = 3
+
+# Which extracted fields a changed section can affect. "Preamble" is Header text
+# beyond the contact details (a summary before the first heading, or the whole body
+# of a resume without recognised headings); it isn't listed, so it can affect anything.
+SECTION_FIELDS = {
+    "Header": ["Name", "Email", "Phone"],
+    "Summary": ["Domain of expertise"],
+    "Education": ["Education"],
+    "Skills": ["Skills", "Domain of expertise"],
+    "Projects": ["Projects"],
+    "Certifications": ["Certifications"],
+    "Internships / Work experience": ["Internships / Work experience", "Domain of expertise"],
+    "Achievements": [],
+    "Publications": [],
+}
+
+
+def _shingle_hashes(text):
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        words = words + [""] * (SHINGLE_WORDS - len(words))
+    return {
+        zlib.crc32(" ".join(words[i:i + SHINGLE_WORDS]).encode("utf-8"))
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    }
+
+
+def signature(text):
+    """MinHash signature (NUM_PERM 32-bit values) of the text's 5-word shingles."""
+    hashes = _shingle_hashes(text)
+    try:
+        import numpy as np
+    except ImportError:
+        return array("I", (
+            min(((a * h + b) % _MERSENNE) & _MAX_HASH for h in hashes) for a, b in _PERMUTATIONS
+        ))
+    values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    a = np.array([p[0] for p in _PERMUTATIONS], dtype=np.uint64)[:, None]
+    b = np.array([p[1] for p in _PERMUTATIONS], dtype=np.uint64)[:, None]
+    # a, b and the hashes are < 2^32, so a * h + b can't overflow 64 bits
+    minima = (((a * values + b) % _MERSENNE) & _MAX_HASH).min(axis=1)
+    return array("I", minima.astype(np.uint32).tobytes())
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity: the share of matching MinHash values."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def _band_buckets(sig):
+    buckets = []
+    for band in range(BANDS):
+        rows = sig[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(rows, digest_size=8, person=band.to_bytes(2, "little")).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+
+def _split_header(body):
+    """(contact lines, everything else) of the text before the first heading."""
+    contact, rest = [], []
+    for line in (line.strip() for line in body.split("\n")):
+        if not line:
+            continue
+        if len(contact) < HEADER_CONTACT_LINES or EMAIL_RE.search(line) or PHONE_RE.search(line) or URL_RE.search(line):
+            contact.append(line)
+        else:
+            rest.append(line)
+    return "\n".join(contact), "\n".join(rest)
+
+
+def section_hashes(text):
+    """{section name: fingerprint of its body}, to tell which parts of a near-duplicate changed."""
+    hashes = {}
+
+    def add(name, body):
+        body = " ".join(body.split()).lower()
+        digest = hashlib.sha256(body.encode("utf-8")).hexdigest()[:16]
+        # Repeated headings (two "Projects" blocks) fold into one fingerprint
+        hashes[name] = hashes[name] + digest if name in hashes else digest
+
+    for section in detect_sections(text):
+        body = text[section.start:section.end]
+        if section.name == "Header":
+            contact, rest = _split_header(body)
+            add("Header", contact)
+            if rest:
+                add("Preamble", rest)
+        else:
+            add(section.name, body)
+    return hashes
+
+
+def changed_fields(old_sections, new_sections):
+    """Fields to re-extract given the section fingerprints of two versions of a resume."""
+    fields = []
+    for name in set(old_sections) | set(new_sections):
+        if old_sections.get(name) != new_sections.get(name):
+            # An unrecognised section can hold anything, so everything is re-extracted
+            for field in SECTION_FIELDS.get(name, ["*"]):
+                if field not in fields:
+                    fields.append(field)
+    return fields
+
+
+class NearDuplicate(NamedTuple):
+    doc_id: int
+    similarity: float
+    data: dict                  # the earlier extraction
+    changed_fields: list        # fields whose sections differ; ["*"] means re-extract everything
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index of extracted resumes, persisted in SQLite next to the
+    LLM cache. `query(text)` finds an earlier resume whose shingle
+    similarity is at least `threshold` with one indexed lookup over the
+    LSH band buckets, then compares section fingerprints to say which
+    fields need extracting again. Extractions are only matched against ones
+    made with the same `version` (prompt and models). Entries expire after
+    `ttl` seconds and the oldest are evicted beyond `max_documents`.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, threshold=THRESHOLD, ttl=TTL, max_documents=MAX_DOCUMENTS):
+        self.path = path
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_documents = max_documents
+        self.reused = 0
+        self.partial = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id INTEGER PRIMARY KEY,
+                text_hash TEXT NOT NULL,
+                version TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                sections TEXT NOT NULL,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                UNIQUE (text_hash, version)
+            );
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                bucket INTEGER NOT NULL,
+                doc_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS lsh_buckets_bucket ON lsh_buckets (bucket);
+            CREATE INDEX IF NOT EXISTS lsh_buckets_doc ON lsh_buckets (doc_id);
+            CREATE INDEX IF NOT EXISTS documents_created ON documents (created_at);
+            """
+        )
+
+    @staticmethod
+    def _prepare(text):
+        text = normalize_text(text)
+        return text, hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def add(self, text, data, version="", sig=None):
+        """Index an extraction; returns its doc_id. Re-adding the same text updates its data."""
+        text, text_hash = self._prepare(text)
+        sig = sig if sig is not None else signature(text)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT doc_id FROM documents WHERE text_hash = ? AND version = ?", (text_hash, version)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE documents SET data = ? WHERE doc_id = ?", (json.dumps(data), row[0]))
+                return row[0]
+            self._conn.execute("BEGIN")
+            try:
+                cursor = self._conn.execute(
+                    "INSERT INTO documents (text_hash, version, signature, sections, data, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (text_hash, version, sig.tobytes(), json.dumps(section_hashes(text)), json.dumps(data), time.time()),
+                )
+                doc_id = cursor.lastrowid
+                self._conn.executemany(
+                    "INSERT INTO lsh_buckets VALUES (?, ?)", [(bucket, doc_id) for bucket in _band_buckets(sig)]
+                )
+                if doc_id % EVICT_EVERY == 0:
+                    self._evict()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return doc_id
+
+    def _evict(self):
+        cutoff = time.time() - self.ttl if self.ttl else 0.0
+        extra = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0] - self.max_documents
+        self._delete_where(
+            "created_at < ? OR doc_id IN (SELECT doc_id FROM documents ORDER BY created_at LIMIT ?)",
+            (cutoff, max(extra, 0)),
+        )
+
+    def _delete_where(self, condition, params=()):
+        doomed = [row[0] for row in self._conn.execute(f"SELECT doc_id FROM documents WHERE {condition}", params)]
+        for start in range(0, len(doomed), 500):
+            batch = doomed[start:start + 500]
+            marks = ",".join("?" * len(batch))
+            self._conn.execute(f"DELETE FROM lsh_buckets WHERE doc_id IN ({marks})", batch)
+            self._conn.execute(f"DELETE FROM documents WHERE doc_id IN ({marks})", batch)
+        return len(doomed)
+
+    def query(self, text, version="", sig=None):
+        """The most similar indexed resume at or above the threshold, or None."""
+        text, text_hash = self._prepare(text)
+        sig = sig if sig is not None else signature(text)
+        buckets = _band_buckets(sig)
+        cutoff = time.time() - self.ttl if self.ttl else 0.0
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT doc_id, data FROM documents WHERE text_hash = ? AND version = ? AND created_at >= ?",
+                (text_hash, version, cutoff),
+            ).fetchone()
+            if row is not None:
+                self.reused += 1
+                return NearDuplicate(row[0], 1.0, json.loads(row[1]), [])
+
+            candidates = self._conn.execute(
+                "SELECT doc_id, signature, sections, data FROM documents WHERE version = ? AND created_at >= ? "
+                f"AND doc_id IN (SELECT doc_id FROM lsh_buckets WHERE bucket IN ({','.join('?' * len(buckets))}))",
+                [version, cutoff] + buckets,
+            ).fetchall()
+            best = None
+            for doc_id, blob, sections, data in candidates:
+                score = similarity(sig, array("I", blob))
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (doc_id, score, sections, data)
+            if best is None:
+                return None
+            changed = changed_fields(json.loads(best[2]), section_hashes(text))
+            if changed:
+                self.partial += 1
+            else:
+                self.reused += 1
+            return NearDuplicate(best[0], best[1], json.loads(best[3]), changed)
+
+    def stats(self):
+        with self._lock:
+            documents = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            return {"documents": documents, "reused": self.reused, "partial": self.partial}
+
+    def invalidate(self, keep_prefix=None):
+        """
+        Drop extractions whose version doesn't start with `keep_prefix`
+        (everything when it's None). Returns the number of resumes removed.
+        """
+        with self._lock:
+            if keep_prefix is None:
+                removed = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+                self._conn.execute("DELETE FROM lsh_buckets")
+                self._conn.execute("DELETE FROM documents")
+                return removed
+            self._conn.execute("BEGIN")
+            try:
+                removed = self._delete_where("substr(version, 1, ?) != ?", (len(keep_prefix), keep_prefix))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return removed
+
+    def clear(self):
+        self.invalidate()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_index = None
+_index_opened = False
+_index_lock = threading.Lock()
+
+
+def get_dedup_index():
+    """
+    Process-wide index, opened on first use. None when RESUME_DEDUP=0 or when
+    the index file can't be created (e.g. a read-only filesystem).
+    """
+    global _index, _index_opened
+    if os.getenv("RESUME_DEDUP", "1") == "0":
+        return None
+    if not _index_opened:
+        with _index_lock:
+            if not _index_opened:
+                try:
+                    _index = NearDuplicateIndex()
+                except (OSError, sqlite3.Error) as e:
+                    warnings.warn(f"Near-duplicate index disabled, can't open {DEFAULT_PATH}: {e}", RuntimeWarning)
+                _index_opened = True
+    return _index
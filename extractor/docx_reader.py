@@ -0,0 +1,117 @@
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_P, _T, _TAB, _BR, _CR = W + "p", W + "t", W + "tab", W + "br", W + "cr"
+_TBL, _TR, _TC = W + "tbl", W + "tr", W + "tc"
+_PAGE_BREAK = W + "lastRenderedPageBreak"
+_BR_TYPE = W + "type"
+
+_HEADER = re.compile(r"word/header\d*\.xml$")
+_FOOTER = re.compile(r"word/footer\d*\.xml$")
+
+
+def _parts(zf):
+    # Same order docx2txt uses: headers, body, footers. Media is never opened.
+    names = zf.namelist()
+    headers = sorted(n for n in names if _HEADER.match(n))
+    footers = sorted(n for n in names if _FOOTER.match(n))
+    return headers + ["word/document.xml"] + footers
+
+
+def _iter_part(stream):
+    """
+    Yield ("text", line) for each paragraph or table row and ("page", None)
+    at every page break, parsing the part incrementally and discarding each
+    paragraph/table as soon as it has been read.
+    """
+    stack = []
+    para = []       # text runs of the current paragraph
+    rows = []       # one list of cell texts per open table row (nested tables)
+    cells = []      # paragraph texts of each open table cell
+
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if elem.tag == _TR:
+                rows.append([])
+            elif elem.tag == _TC:
+                cells.append([])
+            elif elem.tag == _P:
+                para = []
+            continue
+
+        stack.pop()
+        tag = elem.tag
+        if tag == _T:
+            if elem.text:
+                para.append(elem.text)
+        elif tag == _TAB:
+            para.append("\t")
+        elif tag == _CR:
+            para.append("\n")
+        elif tag == _BR:
+            if elem.get(_BR_TYPE) == "page":
+                if para:
+                    yield "text", "".join(para)
+                    para = []
+                yield "page", None
+            else:
+                para.append("\n")
+        elif tag == _PAGE_BREAK:
+            yield "page", None
+        elif tag == _P:
+            line = "".join(para)
+            para = []
+            if cells:
+                cells[-1].append(line)
+            elif line.strip():
+                yield "text", line
+        elif tag == _TC:
+            text = " ".join(p for p in cells.pop() if p.strip())
+            if cells:
+                cells[-1].append(text)
+            elif rows:
+                rows[-1].append(text)
+        elif tag == _TR:
+            row = rows.pop()
+            if cells:
+                cells[-1].append("\t".join(row))
+            elif any(c.strip() for c in row):
+                yield "text", "\t".join(row)
+        elif tag != _TBL:
+            continue
+
+        # Drop what we've consumed so memory stays flat for huge documents
+        if tag in (_P, _TBL) and stack:
+            elem.clear()
+            stack[-1].remove(elem)
+
+
+def iter_docx_native(file, unit="page"):
+    """
+    Stream text out of a .docx: headers, body (including tables) and footers.
+    unit="block" yields each paragraph / table row; unit="page" yields the
+    text between page breaks, with each header and footer part on its own.
+    """
+    with zipfile.ZipFile(file) as zf:
+        for part in _parts(zf):
+            try:
+                stream = zf.open(part)
+            except KeyError:
+                continue
+            page = []
+            with stream:
+                for kind, text in _iter_part(stream):
+                    if kind == "text":
+                        if unit == "block":
+                            yield text
+                        else:
+                            page.append(text)
+                    elif page:
+                        yield "\n".join(page)
+                        page = []
+            if page:
+                yield "\n".join(page)
@@ -0,0 +1,146 @@
+import re
+from typing import NamedTuple
+
+# Fields at or above this confidence are taken as-is and left out of the LLM prompt
+CONFIDENT = 0.9
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"(?<![\w+])(\+?\d[\d\s().-]{6,}\d)(?!\w)")
+URL_RE = re.compile(r"https?://|www\.|linkedin\.com|github\.com", re.I)
+NAME_WORD_RE = re.compile(r"^[A-Z][a-zA-Z'’-]*\.?$|^[A-Z]{2,}$")
+
+# Canonical section -> heading spellings seen in resumes
+SECTION_HEADINGS = {
+    "Summary": ["summary", "profile", "professional summary", "objective", "career objective", "about me"],
+    "Education": ["education", "academic background", "academics", "qualifications", "educational qualifications"],
+    "Skills": ["skills", "technical skills", "key skills", "core competencies", "technologies", "tech stack"],
+    "Projects": ["projects", "academic projects", "personal projects", "key projects"],
+    "Certifications": ["certifications", "certificates", "licenses", "courses", "certifications & courses"],
+    "Internships / Work experience": [
+        "experience", "work experience", "professional experience", "employment", "employment history",
+        "internships", "internship", "work history", "internships / work experience",
+    ],
+    "Achievements": ["achievements", "awards", "honors", "accomplishments"],
+    "Publications": ["publications", "research", "papers"],
+}
+_HEADING_LOOKUP = {spelling: name for name, spellings in SECTION_HEADINGS.items() for spelling in spellings}
+_HEADING_CLEAN_RE = re.compile(r"[^a-z&/ ]+")
+
+
+class FieldGuess(NamedTuple):
+    value: str
+    confidence: float
+
+
+class Section(NamedTuple):
+    name: str      # canonical section name (a key of SECTION_HEADINGS), or "Header" for the top
+    heading: str   # the heading line as written
+    start: int     # character offsets of the section body in the text
+    end: int
+
+
+def _heading_name(line):
+    stripped = line.strip()
+    if not stripped or len(stripped) > 40:
+        return None
+    key = _HEADING_CLEAN_RE.sub("", stripped.lower()).strip()
+    key = re.sub(r"\s+", " ", key)
+    return _HEADING_LOOKUP.get(key)
+
+
+def detect_sections(text):
+    """
+    Split resume text on recognised section headings. The text before the
+    first heading (usually name and contact details) is the "Header" section.
+    """
+    sections = []
+    current_name, current_heading, body_start = "Header", "", 0
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        name = _heading_name(line)
+        if name is not None:
+            sections.append(Section(current_name, current_heading, body_start, offset))
+            current_name, current_heading, body_start = name, line.strip(), offset + len(line)
+        offset += len(line)
+    sections.append(Section(current_name, current_heading, body_start, len(text)))
+    return [s for s in sections if s.end > s.start or s.heading]
+
+
+def _guess_email(text):
+    emails = list(dict.fromkeys(m.group(0).rstrip(".") for m in EMAIL_RE.finditer(text)))
+    if not emails:
+        return None
+    return FieldGuess(emails[0], 0.99 if len(emails) == 1 else 0.9)
+
+
+_YEAR_RANGE_RE = re.compile(r"(19|20)\d{2}\s*[-–]\s*(19|20)\d{2}")
+_DECIMAL_IN_PARENS_RE = re.compile(r"\(\s*\d+\.\d+")
+_YEAR_RE = re.compile(r"(?<!\d)(19|20)\d{2}(?!\d)")
+_PHONE_LABEL_RE = re.compile(r"\b(phone|mobile|mob|cell|tel|telephone|ph|contact)\b\.?\s*(no\.?|number|#)?\s*[:.\-]?\s*$", re.I)
+_NATIONAL_NUMBER_RE = re.compile(r"\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}")
+
+
+def _guess_phone(text):
+    for match in PHONE_RE.finditer(text[:3000]):
+        candidate = match.group(1).strip()
+        digits = re.sub(r"\D", "", candidate)
+        # Skip date ranges like 2019 - 2021 (alone or followed by a grade) and CGPAs like (8.7)
+        if _YEAR_RANGE_RE.match(candidate) or _DECIMAL_IN_PARENS_RE.search(candidate):
+            continue
+        # A year inside the span makes it more likely a date than a number: leave it to the LLM
+        has_year = _YEAR_RE.search(candidate) is not None
+        if 10 <= len(digits) <= 15:
+            line_start = text.rfind("\n", 0, match.start()) + 1
+            if candidate.startswith("+") or _PHONE_LABEL_RE.search(text[line_start:match.start()]):
+                confidence = 0.95
+            elif _NATIONAL_NUMBER_RE.fullmatch(candidate):
+                confidence = 0.9
+            else:
+                # Unlabelled long digit runs are as often ID, ISBN or account numbers
+                confidence = 0.8
+            return FieldGuess(candidate, 0.6 if has_year else confidence)
+        if 7 <= len(digits) < 10:
+            return FieldGuess(candidate, 0.6)
+    return None
+
+
+def _guess_name(text, email=None):
+    for line in text.splitlines()[:8]:
+        line = line.strip().strip("|•·").strip()
+        if not line or EMAIL_RE.search(line) or URL_RE.search(line) or PHONE_RE.search(line):
+            continue
+        if _heading_name(line) is not None:
+            break
+        words = line.split()
+        if not 2 <= len(words) <= 4 or not all(NAME_WORD_RE.match(w) for w in words):
+            continue
+        name = " ".join(w.title() if w.isupper() else w for w in words)
+        confidence = 0.85
+        if email:
+            local = re.sub(r"[^a-z]", "", email.split("@")[0].lower())
+            if sum(1 for w in words if len(w) > 1 and w.lower().strip(".") in local) >= 1:
+                confidence = 0.95
+        return FieldGuess(name, confidence)
+    return None
+
+
+def pre_extract(text):
+    """
+    Deterministically guess Name, Email and Phone from resume text.
+    Returns {field: FieldGuess(value, confidence)} for the fields found.
+    """
+    guesses = {}
+    email = _guess_email(text)
+    if email:
+        guesses["Email"] = email
+    phone = _guess_phone(text)
+    if phone:
+        guesses["Phone"] = phone
+    name = _guess_name(text, email.value if email else None)
+    if name:
+        guesses["Name"] = name
+    return guesses
+
+
+def confident_fields(guesses, threshold=CONFIDENT):
+    return {field: guess.value for field, guess in guesses.items() if guess.confidence >= threshold}
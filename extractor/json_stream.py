@@ -0,0 +1,76 @@
+import json
+
+
+class TopLevelFieldParser:
+    """
+    Incremental parser for a streamed JSON object. Feed it chunks of model
+    output as they arrive; each call returns the (key, value) pairs of the
+    top-level members that became complete. Anything before the opening
+    brace (prose, a ```json fence) and after the closing brace is ignored.
+    """
+
+    def __init__(self):
+        self._buffer = []      # characters from the opening brace onwards
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = 1
+        self.done = False
+        self.fields = {}
+        self.skipped = 0       # members that weren't valid JSON on their own
+
+    def feed(self, chunk):
+        completed = []
+        if self.done or not chunk:
+            return completed
+        for char in chunk:
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._buffer.append(char)
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._close_member())
+                    self.done = True
+                    break
+            elif char == "," and self._depth == 1:
+                completed.extend(self._close_member())
+        return completed
+
+    def _close_member(self):
+        end = len(self._buffer) - 1  # the ',' or closing '}'
+        member = "".join(self._buffer[self._member_start:end]).strip()
+        self._member_start = len(self._buffer)
+        if not member:
+            return []
+        try:
+            # strict=False: raw newlines inside multi-line descriptions are common and harmless
+            parsed = json.loads("{" + member + "}", strict=False)
+        except ValueError:
+            self.skipped += 1
+            return []
+        self.fields.update(parsed)
+        return list(parsed.items())
+
+    @property
+    def text(self):
+        return "".join(self._buffer)
@@ -0,0 +1,150 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+CACHE_DIR = os.getenv("RESUME_CACHE_DIR", ".cache")
+DEFAULT_PATH = os.getenv("RESUME_LLM_CACHE_PATH", os.path.join(CACHE_DIR, "llm_cache.sqlite3"))
+DEFAULT_TTL = float(os.getenv("RESUME_LLM_CACHE_TTL", str(30 * 24 * 3600)))  # seconds, 0 = never expire
+DEFAULT_MAX_BYTES = int(os.getenv("RESUME_LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """Collapse whitespace so trivially re-flowed copies of a resume share an entry."""
+    return _WHITESPACE.sub(" ", text or "").strip()
+
+
+def prompt_version(template):
+    """Short fingerprint of a prompt template; entries from older prompts never match."""
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+
+class LLMCache:
+    """
+    Persistent LLM response cache stored in SQLite (WAL mode), so it survives
+    restarts and is shared by every process pointing at the same file.
+    Entries expire after `ttl` seconds and the least recently used ones are
+    evicted once the stored responses exceed `max_bytes`.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                prompt_version TEXT NOT NULL,
+                model TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+
+    @staticmethod
+    def make_key(text, version, model):
+        h = hashlib.sha256()
+        for part in (normalize_text(text), version, model):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            if self.ttl and now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return value
+
+    def put(self, key, value, version, model):
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, version, model, value, size, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now):
+        if self.ttl:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Walk from least recently used and drop rows until we're under budget
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", doomed)
+
+    def invalidate(self, version=None, model=None, keep_version=None):
+        """
+        Drop entries matching `version` and/or `model`; with `keep_version`,
+        drop everything written by any other prompt version (versions derived
+        from it, "<keep_version>/...", are kept). No arguments clears the
+        whole cache. Returns the number of rows removed.
+        """
+        clauses, params = [], []
+        if version is not None:
+            clauses.append("prompt_version = ?")
+            params.append(version)
+        if model is not None:
+            clauses.append("model = ?")
+            params.append(model)
+        if keep_version is not None:
+            clauses.append("prompt_version != ? AND substr(prompt_version, 1, ?) != ?")
+            params.extend([keep_version, len(keep_version) + 1, keep_version + "/"])
+        sql = "DELETE FROM llm_cache"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def stats(self):
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+            return {
+                "entries": entries,
+                "bytes": total,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
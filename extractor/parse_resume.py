@@ -1,17 +1,315 @@
-import pdfplumber
-import docx2txt
+import codecs
+import io
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing
+from typing import NamedTuple, Optional
 
-def extract_text_from_pdf(file):
-    with pdfplumber.open(file) as pdf:
-        return "\n".join(page.extract_text() for page in pdf.pages if page.extract_text())
+from extractor.docx_reader import iter_docx_native
+from extractor.spool import open_source
+
+SNIFF_BYTES = 8192
+TEXT_CHUNK_BYTES = 64 * 1024
+
+
+class UnsupportedFormatError(ValueError):
+    """Raised before any LLM call when an upload isn't a PDF, DOCX or plain-text file."""
 
-def extract_text_from_docx(file):
-    return docx2txt.process(file)
 
-def get_resume_text(uploaded_file):
-    if uploaded_file.name.endswith(".pdf"):
-        return extract_text_from_pdf(uploaded_file)
-    elif uploaded_file.name.endswith(".docx"):
-        return extract_text_from_docx(uploaded_file)
+def iter_pdf_pymupdf(file, unit="page"):
+    import fitz  # PyMuPDF
+
+    if getattr(file, "path", None):
+        doc = fitz.open(file.path)  # spooled upload: let MuPDF read the file itself
+    elif isinstance(file, io.BytesIO):
+        doc = fitz.open(stream=file.getvalue(), filetype="pdf")
+    elif hasattr(file, "read"):
+        doc = fitz.open(stream=file.read(), filetype="pdf")
     else:
-        return "Unsupported format"
+        doc = fitz.open(file)
+    with doc:
+        for page in doc:
+            if unit == "block":
+                # (x0, y0, x1, y1, text, block_no, block_type); type 0 is text
+                for block in page.get_text("blocks"):
+                    if block[6] == 0 and block[4].strip():
+                        yield block[4].rstrip("\n")
+            else:
+                text = page.get_text("text")
+                if text.strip():
+                    yield text.rstrip("\n")
+
+
+def iter_pdf_pdfplumber(file, unit="page"):
+    # pdfplumber has no block model, so unit="block" yields whole pages
+    import pdfplumber
+
+    with pdfplumber.open(file) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text()
+            # Release pdfminer's layout objects for this page before moving on
+            page.close()
+            if text:
+                yield text
+
+
+def _detect_encoding(head):
+    for bom, encoding in ((codecs.BOM_UTF8, "utf-8-sig"),
+                          (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16")):
+        if head.startswith(bom):
+            return encoding
+    if b"\x00" in head:
+        return None  # binary
+    try:
+        # final=False: a multi-byte character may be cut at the end of the sample
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    # Legacy 8-bit text (Word "Save as .txt" on Windows); reject if it's mostly control bytes
+    controls = sum(1 for b in head if b < 32 and b not in b"\t\n\r\f")
+    if head and controls / len(head) > 0.05:
+        return None
+    return "cp1252"
+
+
+def iter_txt(file, unit="page"):
+    """
+    Decode plain text incrementally. unit="page" splits on form feeds,
+    unit="block" on blank lines.
+    """
+    head = file.read(SNIFF_BYTES)
+    encoding = _detect_encoding(head) or "utf-8"
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    separator = "\f" if unit == "page" else "\n\n"
+    buffer = ""
+    chunk = head
+    while chunk:
+        buffer = (buffer + decoder.decode(chunk)).replace("\r\n", "\n")
+        *complete, buffer = buffer.split(separator)
+        for piece in complete:
+            if piece.strip():
+                yield piece.strip("\n")
+        chunk = file.read(TEXT_CHUNK_BYTES)
+    buffer += decoder.decode(b"", final=True)
+    if buffer.strip():
+        yield buffer.strip("\n")
+
+
+def detect_format(file):
+    """
+    Identify an upload by its leading bytes rather than its name: "pdf",
+    "docx" or "txt". Raises UnsupportedFormatError for anything else.
+    The file position is restored afterwards.
+    """
+    start = file.tell()
+    head = file.read(SNIFF_BYTES)
+    file.seek(start)
+    name = getattr(file, "name", "upload")
+
+    # The PDF spec allows junk before the header, within the first 1 KB
+    if b"%PDF-" in head[:1024]:
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(file) as zf:
+                is_docx = "word/document.xml" in zf.namelist()
+        except zipfile.BadZipFile:
+            is_docx = False
+        finally:
+            file.seek(start)
+        if is_docx:
+            return "docx"
+        raise UnsupportedFormatError(f"{name} is a zip archive but not a Word document")
+    if head.startswith(b"\xd0\xcf\x11\xe0"):
+        raise UnsupportedFormatError(f"{name} is a legacy .doc file; please save it as .docx or PDF")
+    if not head.strip():
+        raise UnsupportedFormatError(f"{name} is empty")
+    if _detect_encoding(head) is None:
+        raise UnsupportedFormatError(f"{name} is not a PDF, DOCX or text file")
+    return "txt"
+
+
+def iter_docx_docx2txt(file, unit="page"):
+    import docx2txt
+
+    text = docx2txt.process(file)
+    if text:
+        yield text
+
+
+# format -> {backend name -> chunk iterator}; the first registered backend is the default
+BACKENDS = {}
+DEFAULT_BACKENDS = {}
+
+
+def register_backend(fmt, name, func, default=False):
+    """Register `func(file, unit="page")`, a generator of text chunks, for a file format."""
+    BACKENDS.setdefault(fmt, {})[name] = func
+    if default or fmt not in DEFAULT_BACKENDS:
+        DEFAULT_BACKENDS[fmt] = name
+
+
+register_backend("pdf", "pymupdf", iter_pdf_pymupdf)       # fast path
+register_backend("pdf", "pdfplumber", iter_pdf_pdfplumber)  # layout-accurate fallback
+register_backend("docx", "native", iter_docx_native)    # streaming zip/XML reader
+register_backend("docx", "docx2txt", iter_docx_docx2txt)
+register_backend("txt", "text", iter_txt)
+
+# Deployments can pin a backend without code changes, e.g. RESUME_PDF_BACKEND=pdfplumber
+for _fmt in list(BACKENDS):
+    _pinned = os.getenv(f"RESUME_{_fmt.upper()}_BACKEND")
+    if _pinned in BACKENDS[_fmt]:
+        DEFAULT_BACKENDS[_fmt] = _pinned
+
+
+def get_backend(fmt, backend=None):
+    backends = BACKENDS.get(fmt)
+    if not backends:
+        return None
+    name = backend or DEFAULT_BACKENDS[fmt]
+    if name not in backends:
+        raise ValueError(f"Unknown {fmt} backend '{name}'. Available: {', '.join(backends)}")
+    return backends[name]
+
+
+def extract_text_from_pdf(file, backend=None):
+    return "\n".join(get_backend("pdf", backend)(file))
+
+
+def extract_text_from_docx(file, backend=None):
+    return "\n".join(get_backend("docx", backend)(file))
+
+
+def iter_resume_text(uploaded_file, backend=None, unit="page", max_pages=None, max_chars=None):
+    """
+    Yield the resume text one page (or block, with unit="block") at a time.
+    Stops reading after `max_pages` pages/blocks or once `max_chars`
+    characters have been produced; the last chunk is cut to fit. Closing
+    the generator early releases the underlying document.
+
+    `uploaded_file` may be a file-like upload, a path or a bytes buffer;
+    large inputs are memory-mapped rather than copied (see extractor.spool).
+    """
+    with open_source(uploaded_file) as file:
+        fmt = detect_format(file)
+        if backend and backend not in BACKENDS[fmt] and any(backend in b for b in BACKENDS.values()):
+            backend = None  # e.g. backend="pdfplumber" for what turned out to be a DOCX
+        chunks = get_backend(fmt, backend)
+
+        produced = 0
+        with closing(chunks(file, unit=unit)) as it:
+            for count, chunk in enumerate(it, 1):
+                if max_chars is not None and produced + len(chunk) >= max_chars:
+                    if max_chars > produced:
+                        yield chunk[:max_chars - produced]
+                    return
+                produced += len(chunk) + 1  # + the newline get_resume_text joins with
+                yield chunk
+                if max_pages is not None and count >= max_pages:
+                    return
+
+
+def get_resume_text(uploaded_file, backend=None, max_pages=None, max_chars=None):
+    """Full resume text; raises UnsupportedFormatError for files we can't read."""
+    return "\n".join(iter_resume_text(uploaded_file, backend, max_pages=max_pages, max_chars=max_chars))
+
+
+class BatchResult(NamedTuple):
+    source: str            # file path, or the name given with a byte buffer
+    text: Optional[str]
+    error: Optional[str]   # "ExceptionType: message" when extraction failed
+    seconds: float
+
+
+def _source_name(source):
+    return source[0] if isinstance(source, tuple) else os.fspath(source)
+
+
+def _extract_one(source, backend, max_pages, max_chars):
+    start = time.perf_counter()
+    try:
+        name, data = source if isinstance(source, tuple) else (None, source)
+        with open_source(data, name) as file:
+            text = get_resume_text(file, backend, max_pages=max_pages, max_chars=max_chars)
+        return text, None, time.perf_counter() - start
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", time.perf_counter() - start
+
+
+def iter_dir_sources(directory):
+    """Yield paths of every supported resume under a directory, recursively."""
+    for root, _, files in os.walk(directory):
+        for filename in sorted(files):
+            if os.path.splitext(filename)[1].lower().lstrip(".") in BACKENDS:
+                yield os.path.join(root, filename)
+
+
+def iter_zip_sources(zip_path):
+    """Yield (name, bytes) for every supported resume inside a zip, one member at a time."""
+    with zipfile.ZipFile(zip_path) as zf:
+        for info in zf.infolist():
+            ext = os.path.splitext(info.filename)[1].lower().lstrip(".")
+            if info.is_dir() or ext not in BACKENDS:
+                continue
+            yield info.filename, zf.read(info)
+
+
+_NO_MORE = object()
+
+
+def extract_texts(sources, max_workers=None, backend=None, max_pages=None, max_chars=None):
+    """
+    Extract text from many resumes in a process pool, yielding a BatchResult
+    per file in completion order. `sources` is an iterable of file paths or
+    (name, bytes) pairs; it is consumed lazily with a bounded number of files
+    in flight, so a generator over a large zip never sits fully in memory.
+    A failure in one file is reported in its result and doesn't stop the
+    batch. If a parser crashes and takes a worker down, the files in flight
+    at the time are reported as failed and the rest go to a fresh pool.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max_workers * 2
+    sources = iter(sources)
+    retry = []  # taken from `sources` but not accepted by a pool that had just broken
+
+    while True:
+        pending = {}
+        broken = False
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            def submit_next():
+                nonlocal broken
+                source = retry.pop(0) if retry else next(sources, _NO_MORE)
+                if source is _NO_MORE:
+                    return False
+                try:
+                    future = pool.submit(_extract_one, source, backend, max_pages, max_chars)
+                except BrokenProcessPool:
+                    retry.append(source)
+                    broken = True
+                    return False
+                pending[future] = _source_name(source)
+                return True
+
+            while len(pending) < max_in_flight and submit_next():
+                pass
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    try:
+                        text, error, seconds = future.result()
+                    except BrokenProcessPool as e:  # a worker died; every file in flight fails with it
+                        broken = True
+                        text, error, seconds = None, f"{type(e).__name__}: {e}", 0.0
+                    except Exception as e:
+                        text, error, seconds = None, f"{type(e).__name__}: {e}", 0.0
+                    yield BatchResult(name, text, error, seconds)
+                    if not broken:
+                        submit_next()
+        if not broken:
+            return
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+
+from extractor.parse_resume import get_resume_text, UnsupportedFormatError
+from extractor.spool import open_source
+from extractor.worker_pool import get_parser_pool
+from extractor.ai_extractor import FIELDS, PROMPT_TEMPLATE, PROMPT_VERSION, active_model, get_llm_cache
+from extractor.fast_extract import pre_extract, confident_fields
+from extractor.chunking import CHUNK_TOKENS, extract_chunked
+from extractor.compaction import normalize_text
+from extractor.dedup import get_dedup_index, signature
+from extractor.router import route_signature
+from utils.cache import LRUCache
+
+# Shared by every Streamlit session in this server process, so reruns and
+# repeat uploads of the same file skip both the parse and the LLM call.
+analysis_cache = LRUCache(max_entries=int(os.getenv("RESUME_ANALYSIS_CACHE_SIZE", "256")))
+
+# Long portfolios stop being read once we have more than the prompt can use
+MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))
+MAX_CHARS = int(os.getenv("RESUME_MAX_CHARS", "60000"))
+
+
+def analysis_key(file_bytes, filename=""):
+    """Cache key for an upload: its bytes plus everything that shapes the LLM output."""
+    h = hashlib.sha256()
+    h.update(file_bytes)
+    h.update(b"\0")
+    h.update(os.path.splitext(filename)[1].lower().encode("utf-8"))
+    h.update(b"\0")
+    h.update(PROMPT_TEMPLATE.encode("utf-8"))
+    h.update(b"\0")
+    h.update(f"{active_model()}\0{route_signature()}".encode("utf-8"))
+    h.update(f"\0{MAX_PAGES}\0{MAX_CHARS}\0{CHUNK_TOKENS}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _field_cache_key(resume_text, field):
+    # Derived from PROMPT_VERSION so stale-prompt invalidation drops these too
+    version = f"{PROMPT_VERSION}/field:{field}"
+    return get_llm_cache().make_key(resume_text, version, f"{active_model()} {route_signature()}"), version
+
+
+def _cached_fields(resume_text, fields):
+    values = {}
+    llm_cache = get_llm_cache()
+    if llm_cache is None:
+        return values
+    for field in fields:
+        key, _ = _field_cache_key(resume_text, field)
+        cached = llm_cache.get(key)
+        if cached is not None:
+            values[field] = json.loads(cached)
+    return values
+
+
+def _store_fields(resume_text, values):
+    llm_cache = get_llm_cache()
+    if llm_cache is None:
+        return
+    for field, value in values.items():
+        key, version = _field_cache_key(resume_text, field)
+        llm_cache.put(key, json.dumps(value), version, active_model())
+
+
+def extract_fields(resume_text, fields=None, on_field=None, on_fast_fields=None):
+    """
+    Extract only `fields` (all of FIELDS by default), in FIELDS order.
+    Values are cached per field, so asking for more fields later only sends
+    the missing ones to the LLM, in a prompt that names just those. Name,
+    Email and Phone come from the rule-based pre-extractor when it is
+    confident. `on_fast_fields` is called with its preliminary
+    {field: value} before the LLM call starts; with `on_field`, the reply is
+    streamed and `on_field(field, value)` is called for each cached or
+    extracted field as soon as it is known.
+    """
+    wanted = FIELDS if fields is None else [field for field in FIELDS if field in fields]
+    unknown = set(fields or ()) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown resume fields: {', '.join(sorted(unknown))}")
+
+    values = _cached_fields(resume_text, wanted)
+    if on_field is not None:
+        for field, value in values.items():
+            on_field(field, value)
+    missing = [field for field in wanted if field not in values]
+
+    guesses = pre_extract(resume_text) if missing or on_fast_fields is not None else {}
+    if on_fast_fields is not None:
+        on_fast_fields({field: guess.value for field, guess in guesses.items()})
+    fast = {field: value for field, value in confident_fields(guesses).items() if field in missing}
+    remaining = [field for field in missing if field not in fast]
+    if remaining:
+        # All nine fields use the full prompt, which shares cache entries with older results
+        extracted = extract_chunked(resume_text, None if remaining == FIELDS else remaining, on_field=on_field)
+        extracted = {field: value for field, value in extracted.items() if field in remaining}
+        _store_fields(resume_text, extracted)
+        values.update(extracted)
+    values.update(fast)
+    return {field: values[field] for field in wanted if field in values}
+
+
+def extract_with_fast_fields(resume_text, on_fast_fields=None, on_field=None):
+    """
+    Full extraction (extract_fields() for every field), as used by
+    analyze_resume(). If a near-duplicate of the resume was extracted
+    before, its result is reused and only the fields of changed sections
+    are extracted again.
+    """
+    index = get_dedup_index()
+    if index is None:
+        return extract_fields(resume_text, on_field=on_field, on_fast_fields=on_fast_fields)
+
+    version = f"{PROMPT_VERSION} {active_model()} {route_signature()}"
+    sig = signature(normalize_text(resume_text))  # the index shingles normalized text
+    match = index.query(resume_text, version, sig=sig)
+    if match is None or "*" in match.changed_fields:
+        data = extract_fields(resume_text, on_field=on_field, on_fast_fields=on_fast_fields)
+    else:
+        data = {field: value for field, value in match.data.items() if field in FIELDS}
+        if on_field is not None:
+            for field, value in data.items():
+                if field not in match.changed_fields:
+                    on_field(field, value)
+        if match.changed_fields:
+            data.update(extract_fields(resume_text, match.changed_fields, on_field=on_field,
+                                       on_fast_fields=on_fast_fields))
+        data = {field: data[field] for field in FIELDS if field in data}
+    index.add(resume_text, data, version, sig=sig)
+    return data
+
+
+def analyze_resume(uploaded_file, on_fast_fields=None, on_field=None):
+    """
+    Run the upload -> text -> JSON pipeline, memoized on the content hash.
+    Returns (key, data, cached). The callbacks are only called on a cache miss.
+    """
+    file_bytes = uploaded_file.getvalue()
+    key = analysis_key(file_bytes, uploaded_file.name)
+
+    cached = analysis_cache.get(key)
+    if cached is not None:
+        # Stored as JSON so one session can't mutate another session's result
+        return key, json.loads(cached), True
+
+    pool = get_parser_pool()
+    if pool is not None:
+        resume_text = pool.parse(uploaded_file.name, file_bytes, max_pages=MAX_PAGES, max_chars=MAX_CHARS)
+    else:
+        with open_source(file_bytes, uploaded_file.name) as source:
+            resume_text = get_resume_text(source, max_pages=MAX_PAGES, max_chars=MAX_CHARS)
+    if not resume_text.strip():
+        raise UnsupportedFormatError(f"No text could be extracted from {uploaded_file.name} (is it a scanned image?)")
+    data = extract_with_fast_fields(resume_text, on_fast_fields, on_field)
+
+    analysis_cache.put(key, json.dumps(data))
+    return key, data, False
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+
+from extractor.compaction import estimate_tokens
+
+# Which backend answers extraction prompts: openai | fake | replay | record.
+# "fake" and "replay" never touch the network, for benchmarks and load tests.
+PROVIDER = os.getenv("RESUME_LLM_PROVIDER", "openai")
+FAKE_LATENCY = float(os.getenv("RESUME_FAKE_LATENCY", "0.5"))              # seconds before the first token
+FAKE_TOKENS_PER_SEC = float(os.getenv("RESUME_FAKE_TOKENS_PER_SEC", "40"))  # 0 = instant
+CASSETTE_PATH = os.getenv("RESUME_LLM_CASSETTE", os.path.join("benchmarks", "cassettes", "llm.jsonl"))
+
+
+class CassetteMissError(LookupError):
+    """A replay cassette has no recorded reply for this prompt."""
+
+
+class OpenAIProvider:
+    """The real model, through langchain's ChatOpenAI (built on first use)."""
+
+    name = "openai"
+
+    def __init__(self, model, api_key=None, model_kwargs=None):
+        self.model = model
+        self.api_key = api_key
+        self.model_kwargs = model_kwargs or {}
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    if not self.api_key:
+                        raise ValueError("OPENAI_API_KEY not found in environment. Please check your .env file.")
+                    from langchain.chat_models import ChatOpenAI
+
+                    self._client = ChatOpenAI(
+                        openai_api_key=self.api_key,
+                        temperature=0.0,
+                        model=self.model,
+                        model_kwargs=self.model_kwargs
+                    )
+        return self._client
+
+    @staticmethod
+    def _messages(prompt):
+        from langchain.schema import HumanMessage
+
+        return [HumanMessage(content=prompt)]
+
+    def complete(self, prompt):
+        return self._get_client()(self._messages(prompt)).content
+
+    def stream(self, prompt):
+        for chunk in self._get_client().stream(self._messages(prompt)):
+            yield chunk.content
+
+
+_WANTED_RE = re.compile(r"^- (.+)$", re.M)
+
+
+class FakeProvider:
+    """
+    Deterministic offline stand-in. Replies with JSON for the fields the
+    prompt asks for, filled from the resume text by the rule-based
+    extractor, after `latency` seconds plus `tokens_per_sec` pacing. The
+    same prompt always gets the same reply.
+    """
+
+    name = "fake"
+
+    def __init__(self, model="fake", latency=FAKE_LATENCY, tokens_per_sec=FAKE_TOKENS_PER_SEC, jitter=0.0):
+        self.model = model
+        self.latency = latency
+        self.tokens_per_sec = tokens_per_sec
+        self.jitter = jitter
+
+    def reply(self, prompt):
+        from extractor.fast_extract import detect_sections, pre_extract
+
+        text = prompt.split("Resume text:", 1)[-1].strip()
+        guesses = pre_extract(text)
+        sections = {s.name: text[s.start:s.end] for s in detect_sections(text)}
+        data = {}
+        for description in _WANTED_RE.findall(prompt.split("Resume text:", 1)[0]):
+            field = description.split(" (", 1)[0].strip()
+            if field in guesses:
+                data[field] = guesses[field].value
+            elif field == "Domain of expertise":
+                data[field] = "Software"
+            elif field in ("Name", "Email", "Phone"):
+                data[field] = ""
+            else:
+                body = sections.get(field, "")
+                data[field] = [line.strip("-• ").strip() for line in body.splitlines() if line.strip("-• ").strip()]
+        return json.dumps(data, indent=2)
+
+    def _delay(self, prompt):
+        rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+        return max(0.0, self.latency + rng.uniform(-self.jitter, self.jitter))
+
+    def complete(self, prompt):
+        reply = self.reply(prompt)
+        pacing = estimate_tokens(reply) / self.tokens_per_sec if self.tokens_per_sec else 0.0
+        time.sleep(self._delay(prompt) + pacing)
+        return reply
+
+    def stream(self, prompt):
+        reply = self.reply(prompt)
+        time.sleep(self._delay(prompt))
+        chunk_chars = 16  # ~4 tokens per chunk, like the real API
+        for start in range(0, len(reply), chunk_chars):
+            if self.tokens_per_sec:
+                time.sleep(chunk_chars / 4 / self.tokens_per_sec)
+            yield reply[start:start + chunk_chars]
+
+
+class ReplayProvider:
+    """
+    Record/replay cassette: a JSON-lines file of {key, model, reply}, keyed
+    on model and prompt. In "record" mode prompts go to `inner` and the
+    replies are appended; in "replay" mode a prompt that wasn't recorded for
+    `model` raises CassetteMissError.
+    """
+
+    name = "replay"
+
+    def __init__(self, path=CASSETTE_PATH, inner=None, mode="replay", model=None):
+        if mode == "record" and inner is None:
+            raise ValueError("Recording a cassette needs a provider to record from")
+        self.path = path
+        self.inner = inner
+        self.mode = mode
+        # Same model name as the recording, so a replay shares cache entries with the original run
+        self.model = inner.model if inner is not None else model or "replay"
+        self._lock = threading.Lock()
+        self._replies = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._replies[entry["key"]] = entry["reply"]
+
+    def make_key(self, prompt):
+        return hashlib.sha256(f"{self.model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def _record(self, key, reply):
+        with self._lock:
+            self._replies[key] = reply
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "model": self.model, "reply": reply}) + "\n")
+
+    def complete(self, prompt):
+        key = self.make_key(prompt)
+        if key in self._replies:
+            return self._replies[key]
+        if self.mode != "record":
+            raise CassetteMissError(f"No recorded reply for prompt {key[:12]} in {self.path}")
+        reply = self.inner.complete(prompt)
+        self._record(key, reply)
+        return reply
+
+    def stream(self, prompt):
+        key = self.make_key(prompt)
+        if key in self._replies or self.mode != "record":
+            yield self.complete(prompt)
+            return
+        chunks = []
+        for chunk in self.inner.stream(prompt):
+            chunks.append(chunk)
+            yield chunk
+        self._record(key, "".join(chunks))
+
+
+def make_provider(name=PROVIDER, model=None, api_key=None, model_kwargs=None):
+    """Build the provider called `name` (see RESUME_LLM_PROVIDER)."""
+    if name == "openai":
+        return OpenAIProvider(model, api_key, model_kwargs)
+    if name == "fake":
+        return FakeProvider(model=f"fake/{model}" if model else "fake")
+    if name == "replay":
+        return ReplayProvider(model=model)
+    if name == "record":
+        return ReplayProvider(inner=OpenAIProvider(model, api_key, model_kwargs), mode="record")
+    raise ValueError(f"Unknown LLM provider {name!r} (expected openai, fake, replay or record)")
@@ -0,0 +1,164 @@
+import os
+import threading
+import time
+from collections import deque
+
+from extractor.ai_extractor import FIELDS, MODEL_NAME, request_resume_data, stream_resume_data
+from extractor.fast_extract import EMAIL_RE, detect_sections
+from extractor.schema import LIST_FIELDS, parse_resume_json
+
+# Try the cheap model first and send only what fails validation to MODEL_NAME.
+# RESUME_MODEL_ROUTING=0 sends everything straight to MODEL_NAME.
+CHEAP_MODEL = os.getenv("RESUME_CHEAP_MODEL", "gpt-3.5-turbo")
+ROUTING = os.getenv("RESUME_MODEL_ROUTING", "1") != "0" and CHEAP_MODEL != MODEL_NAME
+# Above this share of failed fields the whole document is re-extracted
+ESCALATE_DOCUMENT_RATIO = 0.5
+
+# USD per 1K (prompt, completion) tokens, for the cost counters only
+MODEL_PRICES = {
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "gpt-4": (0.03, 0.06),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4o": (0.005, 0.015),
+    "gpt-4o-mini": (0.00015, 0.0006),
+}
+
+
+def route_signature():
+    """Which models answer, for cache keys of derived results."""
+    return f"{CHEAP_MODEL}>{MODEL_NAME}" if ROUTING else MODEL_NAME
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    prompt_price, completion_price = MODEL_PRICES.get(model.split("/")[-1], (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000
+
+
+def failed_fields(data, fields, text):
+    """
+    Fields of `data` that don't pass the completeness checks: missing or
+    empty, an email that isn't one, or an empty list for a section the
+    resume visibly has.
+    """
+    sections = {s.name for s in detect_sections(text) if s.end > s.start}
+    failed = []
+    for field in fields:
+        value = data.get(field)
+        if field not in data:
+            failed.append(field)
+        elif field == "Email":
+            if EMAIL_RE.search(text) and not (isinstance(value, str) and EMAIL_RE.fullmatch(value.strip())):
+                failed.append(field)
+        elif field in LIST_FIELDS:
+            if not value and field in sections:
+                failed.append(field)
+        elif field in ("Name", "Domain of expertise") and not value:
+            failed.append(field)
+    return failed
+
+
+class _RouteStats:
+    """Per-model latency, cost and escalation counters, for the Settings page."""
+
+    def __init__(self, window=500):
+        self._lock = threading.Lock()
+        self._window = window
+        self.routes = {}
+        self.documents = 0
+        self.escalated_documents = 0
+        self.escalated_fields = 0
+
+    def record_call(self, reply, seconds):
+        with self._lock:
+            route = self.routes.setdefault(
+                reply.model, {"calls": 0, "cached": 0, "cost": 0.0, "latency": deque(maxlen=self._window)}
+            )
+            route["calls"] += 1
+            if reply.cached:
+                route["cached"] += 1
+            else:
+                route["cost"] += estimate_cost(reply.model, reply.prompt_tokens, reply.completion_tokens)
+                route["latency"].append(seconds)
+
+    def record_document(self, escalated_fields):
+        with self._lock:
+            self.documents += 1
+            if escalated_fields:
+                self.escalated_documents += 1
+                self.escalated_fields += escalated_fields
+
+    def stats(self):
+        with self._lock:
+            routes = {}
+            for model, route in self.routes.items():
+                latency = sorted(route["latency"])
+                routes[model] = {
+                    "calls": route["calls"],
+                    "cached": route["cached"],
+                    "cost": route["cost"],
+                    "p50": latency[len(latency) // 2] if latency else 0.0,
+                    "p95": latency[int(len(latency) * 0.95)] if latency else 0.0,
+                }
+            return {
+                "routes": routes,
+                "documents": self.documents,
+                "escalated_documents": self.escalated_documents,
+                "escalated_fields": self.escalated_fields,
+                "escalation_rate": self.escalated_documents / self.documents if self.documents else 0.0,
+            }
+
+
+_stats = _RouteStats()
+
+
+def _ask(text, fields, model, on_field):
+    """One extraction call; returns (data, ok) where ok is False if the reply couldn't be parsed."""
+    start = time.perf_counter()
+    try:
+        if on_field is None:
+            reply = request_resume_data(text, fields=fields, model=model)
+            _stats.record_call(reply, time.perf_counter() - start)
+            return parse_resume_json(reply.content), True
+        data = {}
+        replies = []
+        for field, value in stream_resume_data(text, fields=fields, model=model, on_reply=replies.append):
+            data[field] = value
+            on_field(field, value)
+        _stats.record_call(replies[0], time.perf_counter() - start)
+        return data, True
+    except ValueError:
+        if model == MODEL_NAME:
+            raise
+        return {}, False
+
+
+def extract_routed(text, fields=None, on_field=None):
+    """
+    Extract `fields` (all of FIELDS by default) with the cheap model, then
+    re-ask MODEL_NAME for the fields that fail validation, or for the whole
+    document if the reply is unusable. `on_field(field, value)` streams
+    fields as they arrive; an escalated field is reported again with the
+    better value.
+    """
+    wanted = list(fields) if fields is not None else FIELDS
+    if not ROUTING:
+        data, _ = _ask(text, fields, MODEL_NAME, on_field)
+        _stats.record_document(0)
+        return data
+
+    data, ok = _ask(text, fields, CHEAP_MODEL, on_field)
+    failed = failed_fields(data, wanted, text) if ok else wanted
+    if failed:
+        whole = not ok or len(failed) > len(wanted) * ESCALATE_DOCUMENT_RATIO
+        retry_fields = fields if whole else failed
+        better, _ = _ask(text, retry_fields, MODEL_NAME, on_field)
+        if whole:
+            data.update(better)
+        else:
+            data.update({field: value for field, value in better.items() if field in failed})
+    _stats.record_document(len(failed))
+    return data
+
+
+def routing_stats():
+    return _stats.stats()
@@ -0,0 +1,284 @@
+import json
+import re
+import threading
+from typing import List, TypedDict, Union
+
+# What the model is asked to return (see FIELD_DESCRIPTIONS in ai_extractor).
+# Keys contain spaces and slashes, hence the functional TypedDict form.
+ResumeData = TypedDict(
+    "ResumeData",
+    {
+        "Name": str,
+        "Email": str,
+        "Phone": str,
+        "Education": List[Union[dict, str]],
+        "Skills": List[str],
+        "Projects": List[Union[dict, str]],
+        "Certifications": List[Union[dict, str]],
+        "Internships / Work experience": List[Union[dict, str]],
+        "Domain of expertise": str,
+    },
+    total=False,
+)
+
+SCALAR_FIELDS = ("Name", "Email", "Phone", "Domain of expertise")
+LIST_FIELDS = ("Education", "Skills", "Projects", "Certifications", "Internships / Work experience")
+
+# Spellings the model uses for our fields, after _alias_key() normalization
+KEY_ALIASES = {
+    "name": "Name",
+    "full name": "Name",
+    "candidate name": "Name",
+    "email": "Email",
+    "email address": "Email",
+    "e mail": "Email",
+    "phone": "Phone",
+    "phone number": "Phone",
+    "mobile": "Phone",
+    "mobile number": "Phone",
+    "contact number": "Phone",
+    "education": "Education",
+    "skills": "Skills",
+    "technical skills": "Skills",
+    "projects": "Projects",
+    "certifications": "Certifications",
+    "certificates": "Certifications",
+    "internships work experience": "Internships / Work experience",
+    "internships and work experience": "Internships / Work experience",
+    "internship work experience": "Internships / Work experience",
+    "work experience": "Internships / Work experience",
+    "experience": "Internships / Work experience",
+    "internships": "Internships / Work experience",
+    "domain of expertise": "Domain of expertise",
+    "domain": "Domain of expertise",
+    "expertise": "Domain of expertise",
+    "area of expertise": "Domain of expertise",
+}
+
+_KEY_CLEAN_RE = re.compile(r"[^a-z0-9]+")
+_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.S)
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+def _alias_key(key):
+    return _KEY_CLEAN_RE.sub(" ", key.lower().replace("&", " and ")).strip()
+
+
+def canonical_field(key):
+    """Our field name for a key the model wrote, or the key unchanged if unknown."""
+    return KEY_ALIASES.get(_alias_key(key), key)
+
+
+def coerce_field(field, value):
+    """Bring one value to the schema's type: lists for list fields, strings for scalars."""
+    if field in LIST_FIELDS:
+        if value is None or value == "":
+            return []
+        if isinstance(value, str):
+            separator = "\n" if "\n" in value else ","
+            return [part.strip(" -•\t") for part in value.split(separator) if part.strip(" -•\t")]
+        if isinstance(value, dict):
+            return [value]
+        return list(value)
+    if field in SCALAR_FIELDS:
+        if value is None:
+            return ""
+        if isinstance(value, list):
+            return ", ".join(str(v) for v in value)
+        return str(value) if not isinstance(value, str) else value.strip()
+    return value
+
+
+def validate_resume(data):
+    """Normalize keys and coerce values to ResumeData; unknown keys are kept as-is."""
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object from the model, got {type(data).__name__}")
+    validated = {}
+    for key, value in data.items():
+        field = canonical_field(key)
+        value = coerce_field(field, value)
+        if field in validated and not value:
+            continue  # an empty alias must not overwrite a filled field
+        validated[field] = value
+    return validated
+
+
+def _opens_string(char, previous):
+    """Whether `char` starts a string: any '"', or a "'" where a key or value may begin."""
+    return char == '"' or (char == "'" and previous in "{[,:")
+
+
+def _outer_object(text):
+    """The text from the first '{' to its matching '}' (or to the end if unbalanced)."""
+    start = text.find("{")
+    if start < 0:
+        return text
+    depth, quote, escape, previous = 0, None, False, "{"
+    for i in range(start, len(text)):
+        char = text[i]
+        if quote:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == quote:
+                quote, previous = None, char
+            continue
+        if _opens_string(char, previous):
+            quote = char
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+        if char not in " \t\r\n":
+            previous = char
+    return text[start:]
+
+
+def _fix_tokens(text):
+    """
+    Drop trailing commas, swap Python literals, turn single-quoted strings
+    into double-quoted ones and close anything left open, outside strings.
+    """
+    out, stack = [], []
+    quote, escape = None, False
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if quote == '"':
+            out.append(char)
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                quote = None
+        elif quote == "'":
+            if escape:
+                escape = False
+                out.append(char if char == "'" else "\\" + char)  # \' needs no escape in JSON
+            elif char == "\\":
+                escape = True
+            elif char == "'":
+                quote = None
+                out.append('"')
+            else:
+                out.append('\\"' if char == '"' else char)
+        elif _opens_string(char, next((c for c in reversed(out) if c not in " \t\r\n"), "{")):
+            quote = char
+            out.append('"')
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+            out.append(char)
+        elif char in "}]":
+            while out and out[-1] in " \t\r\n":
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            if stack:
+                stack.pop()
+            out.append(char)
+        else:
+            word = re.match(r"True|False|None", text[i:])
+            if word and not (out and (out[-1].isalnum() or out[-1] == "_")):
+                out.append(_PY_LITERALS[word.group(0)])
+                i += len(word.group(0))
+                continue
+            out.append(char)
+        i += 1
+    if quote:
+        out.append('"')
+    closing = "".join(reversed(stack))
+    repaired = "".join(out).rstrip().rstrip(",")
+    return repaired + closing
+
+
+def repair_json(raw):
+    """
+    Best-effort local fix of a malformed model reply: strips markdown fences
+    and surrounding prose, smart quotes, single-quoted strings, trailing
+    commas and Python literals, and closes a reply that was cut off
+    mid-object.
+    """
+    text = raw.translate(_SMART_QUOTES)
+    fenced = _FENCE_RE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    return _fix_tokens(_outer_object(text))
+
+
+class _RepairCounter:
+    """How often replies needed repair, for the Settings page."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.parsed = 0
+        self.repaired = 0
+        self.failed = 0
+
+    def record(self, outcome):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self):
+        with self._lock:
+            total = self.parsed + self.repaired + self.failed
+            return {
+                "replies": total,
+                "repaired": self.repaired,
+                "failed": self.failed,
+                "repair_rate": self.repaired / total if total else 0.0,
+            }
+
+
+_repairs = _RepairCounter()
+
+
+def _parse(raw):
+    """(validated data, "parsed" or "repaired"); raises ValueError."""
+    # strict=False lets raw newlines and tabs through inside strings (multi-line descriptions)
+    try:
+        data = json.loads(raw, strict=False)
+        outcome = "parsed"
+    except ValueError:
+        try:
+            data = json.loads(repair_json(raw), strict=False)
+        except ValueError as e:
+            raise ValueError(f"Model reply is not valid JSON and could not be repaired: {e}") from e
+        outcome = "repaired"
+    return validate_resume(data), outcome
+
+
+def parse_resume_json(raw):
+    """
+    Parse and validate a model reply. Malformed JSON is repaired locally
+    instead of asking the model again; raises ValueError only if that fails.
+    """
+    try:
+        validated, outcome = _parse(raw)
+    except ValueError:
+        _repairs.record("failed")
+        raise
+    _repairs.record(outcome)
+    return validated
+
+
+def is_usable_reply(raw):
+    """Whether parse_resume_json() would accept `raw`, without counting it in repair_stats()."""
+    try:
+        _parse(raw)
+    except ValueError:
+        return False
+    return True
+
+
+def record_reply(outcome):
+    """Count a reply checked outside parse_resume_json(), e.g. one the stream parser read cleanly."""
+    _repairs.record(outcome)
+
+
+def repair_stats():
+    return _repairs.stats()
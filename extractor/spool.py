@@ -0,0 +1,124 @@
+import io
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Uploads above this size are parsed from a memory-mapped file instead of RAM
+SPOOL_THRESHOLD = int(float(os.getenv("RESUME_SPOOL_THRESHOLD_MB", "2")) * 1024 * 1024)
+SPOOL_DIR = os.getenv("RESUME_SPOOL_DIR") or None  # None = system temp dir
+
+
+class MappedFile:
+    """
+    Read-only, seekable file object over a memory-mapped file. Pages are
+    loaded by the OS on demand and can be dropped under memory pressure, so
+    a large upload doesn't count against the process heap. `path` lets
+    backends that prefer a filename (PyMuPDF) open it directly.
+    """
+
+    def __init__(self, path, name=None):
+        self.path = path
+        self.name = name or os.path.basename(path)
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read(self, size=-1):
+        return self._map.read(None if size is None or size < 0 else size)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self._map.seek(offset, whence)
+        return self._map.tell()
+
+    def tell(self):
+        return self._map.tell()
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def getbuffer(self):
+        return memoryview(self._map)
+
+    def close(self):
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def __len__(self):
+        return len(self._map)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _named_bytes(data, name):
+    # BytesIO(bytes) shares the bytes object until written to, so this is zero-copy
+    file = io.BytesIO(data)
+    file.name = name
+    return file
+
+
+@contextmanager
+def spool_bytes(data, suffix=""):
+    """Write a buffer to a temp file and yield its path; the file is removed afterwards."""
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=SPOOL_DIR)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        yield path
+    finally:
+        os.unlink(path)
+
+
+@contextmanager
+def open_source(source, name=None, threshold=None):
+    """
+    Open a path, a bytes-like buffer or a file-like upload (e.g. Streamlit's
+    UploadedFile) as a seekable binary file for the parser backends.
+    Small inputs stay in memory without copying; anything over `threshold`
+    bytes is memory-mapped (paths directly, buffers after spooling to disk).
+    """
+    threshold = SPOOL_THRESHOLD if threshold is None else threshold
+
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        name = name or os.path.basename(path)
+        if os.path.getsize(path) > threshold:
+            with MappedFile(path, name) as file:
+                yield file
+        else:
+            with open(path, "rb") as f:
+                yield _named_bytes(f.read(), name)
+        return
+
+    if isinstance(source, MappedFile):
+        source.seek(0)
+        yield source
+        return
+
+    if hasattr(source, "getvalue"):
+        name = name or getattr(source, "name", "upload")
+        data = source.getvalue()
+    elif hasattr(source, "read"):
+        name = name or getattr(source, "name", "upload")
+        data = source.read()
+    else:
+        data = source
+    name = name or "upload"
+
+    if len(data) > threshold:
+        with spool_bytes(data, os.path.splitext(name)[1]) as path:
+            with MappedFile(path, name) as file:
+                yield file
+    else:
+        yield _named_bytes(bytes(data) if not isinstance(data, bytes) else data, name)
@@ -0,0 +1,191 @@
+import atexit
+import multiprocessing
+import os
+import queue
+import resource
+import sys
+import threading
+
+from extractor.parse_resume import get_resume_text
+from extractor.spool import SPOOL_THRESHOLD, open_source, spool_bytes
+
+POOL_SIZE = int(os.getenv("RESUME_PARSE_WORKERS", "2"))
+MAX_DOCS_PER_WORKER = int(os.getenv("RESUME_PARSE_MAX_DOCS", "50"))
+MAX_WORKER_RSS_MB = int(os.getenv("RESUME_PARSE_MAX_RSS_MB", "512"))
+PARSE_TIMEOUT = float(os.getenv("RESUME_PARSE_TIMEOUT", "60"))
+
+
+class ParseTimeoutError(RuntimeError):
+    pass
+
+
+class ParseWorkerError(RuntimeError):
+    pass
+
+
+def _rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, IndexError):
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+
+def _worker_main(conn):
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        # `payload` is the document bytes, or the path of a spooled copy for large uploads
+        name, payload, backend, max_pages, max_chars = job
+        try:
+            with open_source(payload, name) as file:
+                result = (get_resume_text(file, backend, max_pages=max_pages, max_chars=max_chars), None)
+        except Exception as e:
+            result = (None, e)
+        del payload
+        conn.send(result + (_rss_mb(),))
+
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.docs = 0
+
+    def stop(self, kill=False):
+        if not kill and self.process.is_alive():
+            try:
+                self.conn.send(None)
+                self.process.join(timeout=2)
+            except (OSError, BrokenPipeError):
+                pass
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ParserPool:
+    """
+    A few long-lived subprocesses that do the PDF/DOCX parsing, so parser heap
+    growth never lands in the Streamlit process. A worker is replaced after
+    `max_docs` documents or once its RSS passes `max_rss_mb`, and is killed
+    outright if one document takes longer than `timeout` seconds.
+    """
+
+    def __init__(self, size=POOL_SIZE, max_docs=MAX_DOCS_PER_WORKER,
+                 max_rss_mb=MAX_WORKER_RSS_MB, timeout=PARSE_TIMEOUT):
+        self.size = size
+        self.max_docs = max_docs
+        self.max_rss_mb = max_rss_mb
+        self.timeout = timeout
+        # spawn, not fork: the server process is multi-threaded
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = 0
+        self._closed = False
+        self.documents = 0
+        self.recycled = 0
+        self.timeouts = 0
+        self.crashes = 0
+
+    def _acquire(self):
+        with self._lock:
+            if self._closed:
+                raise ParseWorkerError("Parser pool is closed")
+            if self._idle.empty() and self._started < self.size:
+                self._started += 1
+                return _Worker(self._ctx)
+        return self._idle.get()
+
+    def _release(self, worker):
+        with self._lock:
+            if self._closed:
+                worker.stop()
+                return
+        self._idle.put(worker)
+
+    def _replace(self, worker, kill=False):
+        worker.stop(kill=kill)
+        return _Worker(self._ctx)
+
+    def parse(self, name, data, backend=None, max_pages=None, max_chars=None, timeout=None):
+        """
+        Extract text from one document in a worker process; raises the parser's
+        exception on failure. Large buffers are spooled to a temp file and the
+        worker memory-maps it, instead of being copied through the pipe.
+        """
+        if len(data) > SPOOL_THRESHOLD:
+            with spool_bytes(data, os.path.splitext(name)[1]) as path:
+                return self._parse(name, path, backend, max_pages, max_chars, timeout)
+        return self._parse(name, bytes(data), backend, max_pages, max_chars, timeout)
+
+    def _parse(self, name, payload, backend, max_pages, max_chars, timeout):
+        timeout = self.timeout if timeout is None else timeout
+        worker = self._acquire()
+        try:
+            try:
+                worker.conn.send((name, payload, backend, max_pages, max_chars))
+                if not worker.conn.poll(timeout):
+                    self.timeouts += 1
+                    worker = self._replace(worker, kill=True)
+                    raise ParseTimeoutError(f"Parsing {name} took longer than {timeout:.0f}s and was stopped")
+                text, error, rss_mb = worker.conn.recv()
+            except (EOFError, OSError) as e:
+                self.crashes += 1
+                worker = self._replace(worker, kill=True)
+                raise ParseWorkerError(f"Parser worker crashed while reading {name}") from e
+
+            self.documents += 1
+            worker.docs += 1
+            if worker.docs >= self.max_docs or rss_mb > self.max_rss_mb:
+                self.recycled += 1
+                worker = self._replace(worker)
+            if error is not None:
+                raise error
+            return text
+        finally:
+            self._release(worker)
+
+    def stats(self):
+        return {
+            "workers": self._started,
+            "documents": self.documents,
+            "recycled": self.recycled,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+        }
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_parser_pool():
+    """Process-wide parser pool, or None when RESUME_PARSE_WORKERS=0 (parse in-process)."""
+    global _pool
+    if POOL_SIZE <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParserPool()
+            atexit.register(_pool.close)
+        return _pool
@@ -0,0 +1,63 @@
+import os
+import threading
+from functools import lru_cache
+
+from extractor.llm_cache import CACHE_DIR
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+TEMPLATE_NAME = "report_template.html"
+STYLESHEET = os.path.join(TEMPLATE_DIR, "report.css")
+# Compiled templates are kept here so a fresh process doesn't re-parse them
+BYTECODE_CACHE_DIR = os.getenv("RESUME_TEMPLATE_CACHE_DIR", os.path.join(CACHE_DIR, "jinja"))
+
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _template():
+    """The report template, compiled once per process (jinja2 is only imported for HTML/WeasyPrint reports)."""
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+    try:
+        os.makedirs(BYTECODE_CACHE_DIR, exist_ok=True)
+        if not os.access(BYTECODE_CACHE_DIR, os.W_OK):  # jinja2 would fail writing its first entry
+            raise PermissionError(BYTECODE_CACHE_DIR)
+        bytecode_cache = FileSystemBytecodeCache(BYTECODE_CACHE_DIR)
+    except OSError:
+        bytecode_cache = None  # read-only or missing cache dir: compile in memory every process
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=select_autoescape(["html"]),  # resume text is untrusted
+        bytecode_cache=bytecode_cache,
+        auto_reload=False,
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+    return env.get_template(TEMPLATE_NAME)
+
+
+def render_html_report(data, report_type="Comprehensive Analysis", inline_css=True):
+    """Report HTML from templates/report_template.html, with every value escaped."""
+    return _template().render(data=data, report_type=report_type, inline_css=inline_css)
+
+
+@lru_cache(maxsize=None)
+def _pdf_resources():
+    """Font configuration and parsed stylesheet, shared by every WeasyPrint render."""
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+
+    font_config = FontConfiguration()
+    return font_config, CSS(filename=STYLESHEET, font_config=font_config)
+
+
+def render_weasyprint_report(data, out, report_type="Comprehensive Analysis"):
+    """Render the HTML report to PDF with WeasyPrint into `out` (a path or a binary file)."""
+    from weasyprint import HTML
+
+    font_config, stylesheet = _pdf_resources()
+    html = render_html_report(data, report_type, inline_css=False)
+    # Renders share one FontConfiguration, whose fontconfig/pango state isn't thread-safe
+    with _lock:
+        document = HTML(string=html, base_url=TEMPLATE_DIR).render(stylesheets=[stylesheet], font_config=font_config)
+        document.write_pdf(out)
@@ -61,11 +61,24 @@
 
 #     c.save()
 #     return filepath
+from functools import lru_cache
+
 from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
 import os
 
+TITLE = "AI Resume Analysis Report"
+MARGIN = 50
+BODY_FONT, BODY_SIZE, BODY_LEADING = "Helvetica", 12, 18
+HEADING_FONT, HEADING_SIZE, HEADING_LEADING = "Helvetica-Bold", 14, 22
+INDENT = 20
+SECTION_GAP = 10
+CONTENT_TOP = 100     # distance of the first line from the top edge, below the page header
+CONTENT_BOTTOM = 60   # lowest baseline, above the footer
+
+
 def format_value(value):
     if isinstance(value, list):
         if all(isinstance(item, str) for item in value):
@@ -81,63 +94,139 @@ def format_value(value):
     else:
         return str(value)
 
-def generate_pdf_report(data: dict, filename: str = "report.pdf"):
-    os.makedirs("reports", exist_ok=True)
-    filepath = os.path.join("reports", filename)
-    c = canvas.Canvas(filepath, pagesize=A4)
-    width, height = A4
-
-    # Title
-    c.setFont("Helvetica-Bold", 20)
-    c.drawCentredString(width / 2, height - 60, "AI Resume Analysis Report")
-    c.setLineWidth(1)
-    c.setStrokeColor(colors.grey)
-    c.line(50, height - 70, width - 50, height - 70)
-    y = height - 100
-
-    c.setFont("Helvetica", 12)
-    page_num = 1
 
+@lru_cache(maxsize=4096)
+def _width(text, font, size):
+    # Words repeat a lot across a report (and across reports), so widths are memoized
+    return stringWidth(text, font, size)
+
+
+def wrap_text(text, font, size, max_width):
+    """Split one line of text into lines no wider than max_width (long words are broken)."""
+    space = _width(" ", font, size)
+    lines, current, used = [], [], 0.0
+    for word in text.split(" "):
+        width = _width(word, font, size)
+        if width > max_width:
+            # A URL or similar that can't fit on any line: break it by characters
+            if current:
+                lines.append(" ".join(current))
+                current, used = [], 0.0
+            piece = ""
+            for char in word:
+                if piece and _width(piece + char, font, size) > max_width:
+                    lines.append(piece)
+                    piece = ""
+                piece += char
+            word, width = piece, _width(piece, font, size)
+        if current and used + space + width > max_width:
+            lines.append(" ".join(current))
+            current, used = [], 0.0
+        used += width if not current else space + width
+        current.append(word)
+    lines.append(" ".join(current))
+    return lines
+
+
+class _ReportCanvas(canvas.Canvas):
+    """
+    Canvas that draws the page template (title, rule and "Page X of Y"
+    footer) on every page as it is finished. The total page count is only
+    known at the end, so pages are kept and their footers written in save().
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("pageCompression", 1)
+        super().__init__(*args, **kwargs)
+        self._pages = []
+        self._draw_header()
+
+    def _draw_header(self):
+        width, height = self._pagesize
+        self.setFont("Helvetica-Bold", 20)
+        self.drawCentredString(width / 2, height - 60, TITLE)
+        self.setLineWidth(1)
+        self.setStrokeColor(colors.grey)
+        self.line(MARGIN, height - 70, width - MARGIN, height - 70)
+
+    def showPage(self):
+        self._pages.append(dict(self.__dict__))
+        self._startPage()
+        self._draw_header()
+
+    def save(self):
+        self._pages.append(dict(self.__dict__))  # the page in progress
+        total = len(self._pages)
+        for number, state in enumerate(self._pages, 1):
+            self.__dict__.update(state)
+            self.setFont("Helvetica", 10)
+            self.drawCentredString(self._pagesize[0] / 2, 30, f"Page {number} of {total}")
+            super().showPage()
+        super().save()
+
+
+class _Layout:
+    """
+    Top-to-bottom flow of wrapped lines over as many pages as needed. All
+    lines on a page go into one text object, so the font is only set when it
+    changes.
+    """
+
+    def __init__(self, c):
+        self.c = c
+        self.width, self.height = c._pagesize
+        self.y = self.height - CONTENT_TOP
+        self.text = None
+        self.font = None
+
+    def _fit(self, height):
+        # Start a new page unless `height` worth of lines fits above the footer
+        if self.y - height < CONTENT_BOTTOM - BODY_LEADING:
+            self.flush()
+            self.c.showPage()
+            self.y = self.height - CONTENT_TOP
+
+    def flush(self):
+        if self.text is not None:
+            self.c.drawText(self.text)
+            self.text, self.font = None, None
+
+    def line(self, text, font, size, leading, x):
+        self._fit(leading)
+        if self.text is None:
+            self.text = self.c.beginText()
+        if self.font != (font, size):
+            self.text.setFont(font, size)
+            self.font = (font, size)
+        self.text.setTextOrigin(x, self.y)
+        self.text.textOut(text)
+        self.y -= leading
+
+    def paragraph(self, text, font, size, leading, x):
+        for line in wrap_text(text, font, size, self.width - MARGIN - x):
+            self.line(line, font, size, leading, x)
+
+    def section(self, key, value):
+        # Keep a heading on the same page as the first line under it
+        self._fit(HEADING_LEADING + BODY_LEADING)
+        self.line(f"{key}:", HEADING_FONT, HEADING_SIZE, HEADING_LEADING, MARGIN)
+        for text in format_value(value).split("\n"):
+            self.paragraph(text, BODY_FONT, BODY_SIZE, BODY_LEADING, MARGIN + INDENT)
+        self.y -= SECTION_GAP
+
+
+def render_pdf_report(data: dict, out):
+    """Draw the report for `data` into `out`, a path or a binary file object."""
+    c = _ReportCanvas(out, pagesize=A4)
+    layout = _Layout(c)
     for key, value in data.items():
-        # Section header
-        if y < 100:
-            c.showPage()
-            page_num += 1
-            c.setFont("Helvetica-Bold", 20)
-            c.drawCentredString(width / 2, height - 60, "AI Resume Analysis Report")
-            c.setLineWidth(1)
-            c.setStrokeColor(colors.grey)
-            c.line(50, height - 70, width - 50, height - 70)
-            y = height - 100
-            c.setFont("Helvetica", 12)
-
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(50, y, f"{key}:")
-        y -= 22
-
-        c.setFont("Helvetica", 12)
-        formatted_value = format_value(value)
-        lines = formatted_value.split("\n")
-        for line in lines:
-            if y < 70:
-                c.showPage()
-                page_num += 1
-                c.setFont("Helvetica-Bold", 20)
-                c.drawCentredString(width / 2, height - 60, "AI Resume Analysis Report")
-                c.setLineWidth(1)
-                c.setStrokeColor(colors.grey)
-                c.line(50, height - 70, width - 50, height - 70)
-                y = height - 100
-                c.setFont("Helvetica", 12)
-            c.drawString(70, y, line)
-            y -= 18
-        y -= 10  # Extra space between sections
-
-    # Footer with page number
-    for i in range(page_num):
-        c.showPage()
-        c.setFont("Helvetica", 10)
-        c.drawCentredString(width / 2, 30, f"Page {i+1}")
-
+        layout.section(key, value)
+    layout.flush()
     c.save()
-    return filepath
\ No newline at end of file
+    return out
+
+
+def generate_pdf_report(data: dict, filename: str = "report.pdf"):
+    os.makedirs("reports", exist_ok=True)
+    filepath = os.path.join("reports", filename)
+    return render_pdf_report(data, filepath)
@@ -0,0 +1,251 @@
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import NamedTuple, Optional, Union
+
+from utils.cache import LRUCache
+
+# Rendered reports stay in memory up to this size and spill to an anonymous
+# temp file above it; nothing is written to a shared reports/ directory.
+REPORT_SPOOL_BYTES = int(os.getenv("RESUME_REPORT_SPOOL_MB", "8")) * 1024 * 1024
+
+# PDF reports are drawn with reportlab, or set to "weasyprint" to print the HTML
+# template (needs WeasyPrint's pango/cairo system libraries)
+PDF_RENDERER = os.getenv("RESUME_PDF_RENDERER", "reportlab").lower()
+
+# Bump when a renderer's output changes, so cached reports from the old one aren't served
+RENDERER_VERSION = "3"
+
+# Same data and options give the same report, whichever session asks for it
+report_cache = LRUCache(
+    max_entries=int(os.getenv("RESUME_REPORT_CACHE_SIZE", "512")),
+    max_bytes=int(os.getenv("RESUME_REPORT_CACHE_MB", "64")) * 1024 * 1024,
+    sizeof=lambda report: len(report.content),
+)
+
+REPORT_FORMATS = {
+    "PDF": ("pdf", "application/pdf"),
+    "HTML": ("html", "text/html"),
+    "JSON": ("json", "application/json"),
+}
+_UNSAFE_FILENAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+class Report(NamedTuple):
+    content: Union[bytes, io.RawIOBase]  # bytes, or an unbuffered temp file (close it) for reports over REPORT_SPOOL_BYTES
+    filename: str
+    mime: str
+
+
+def report_filename(data, report_type, report_format):
+    """Download name like Jane_Doe_skills_summary_report.pdf, safe for any filesystem."""
+    extension, _ = REPORT_FORMATS[report_format]
+    name = _UNSAFE_FILENAME_RE.sub("_", str(data.get("Name") or "resume")).strip("._") or "resume"
+    return f"{name}_{report_type.lower().replace(' ', '_')}_report.{extension}"
+
+
+def generate_html_report(data, report_type, include_charts, include_recommendations):
+    from utils.html_report import render_html_report  # jinja2 is only imported for HTML reports
+
+    return render_html_report(data, report_type)
+
+
+def unbuffered_file(file):
+    """
+    The contents of a TemporaryFile or SpooledTemporaryFile as a rewound
+    io.RawIOBase, which st.download_button accepts (it rejects buffered
+    read/write files). `file` is closed; close the result once it's been read.
+    """
+    file.flush()
+    raw = io.FileIO(os.dup(file.fileno()), "rb")
+    file.close()
+    raw.seek(0)
+    return raw
+
+
+def _render_pdf(data, report_type):
+    spool = tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_BYTES)
+    try:
+        if PDF_RENDERER == "weasyprint":
+            from utils.html_report import render_weasyprint_report
+
+            render_weasyprint_report(data, spool, report_type)
+        else:
+            from utils.report_generator import render_pdf_report  # reportlab is only imported for PDFs
+
+            render_pdf_report(data, spool)
+        if spool.tell() > REPORT_SPOOL_BYTES:  # rolled over to a temp file
+            return unbuffered_file(spool)
+        spool.seek(0)
+        content = spool.read()
+    finally:
+        spool.close()
+    return content
+
+
+def render_report(data, report_format="PDF", report_type="Comprehensive Analysis",
+                  include_charts=True, include_recommendations=True):
+    """
+    Render a report for `data` in memory. Returns a Report whose content can
+    go straight to st.download_button; close it afterwards when it isn't bytes.
+    """
+    if report_format not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format {report_format!r} (expected one of {', '.join(REPORT_FORMATS)})")
+    _, mime = REPORT_FORMATS[report_format]
+    if report_format == "PDF":
+        content = _render_pdf(data, report_type)
+    elif report_format == "HTML":
+        content = generate_html_report(data, report_type, include_charts, include_recommendations).encode("utf-8")
+    else:
+        content = json.dumps(data, indent=2).encode("utf-8")
+    return Report(content, report_filename(data, report_type, report_format), mime)
+
+
+def report_key(data, report_format, report_type, include_charts, include_recommendations):
+    """Content address of a report: compact JSON of the data plus every rendering option."""
+    h = hashlib.sha256()
+    # Key order is kept, not sorted: the renderers lay sections out in that order
+    h.update(json.dumps(data, separators=(",", ":"), default=str).encode("utf-8"))
+    options = [RENDERER_VERSION, PDF_RENDERER, report_format, report_type, include_charts, include_recommendations]
+    h.update(json.dumps(options).encode("utf-8"))
+    return h.hexdigest()
+
+
+def get_report(data, report_format="PDF", report_type="Comprehensive Analysis",
+               include_charts=True, include_recommendations=True):
+    """render_report() through report_cache. Returns (report, cached)."""
+    key = report_key(data, report_format, report_type, include_charts, include_recommendations)
+    report = report_cache.get(key)
+    if report is not None:
+        return report, True
+    report = render_report(data, report_format, report_type, include_charts, include_recommendations)
+    if isinstance(report.content, bytes):  # spooled giants aren't worth the budget
+        report_cache.put(key, report)
+    return report, False
+
+
+class BatchReportResult(NamedTuple):
+    candidate: str           # Name from the data, or "candidate <n>" when it has none
+    filename: Optional[str]  # member name in the archive; None when rendering failed
+    error: Optional[str]     # "ExceptionType: message" when rendering failed
+    seconds: float
+
+
+def _render_job(data, report_format, report_type, include_charts, include_recommendations):
+    start = time.perf_counter()
+    try:
+        report = render_report(data, report_format, report_type, include_charts, include_recommendations)
+        content = report.content
+        if not isinstance(content, bytes):  # spooled: send bytes back, file objects don't pickle
+            with content:
+                content = content.read()
+        return report.filename, content, None, time.perf_counter() - start
+    except Exception as e:
+        return None, None, f"{type(e).__name__}: {e}", time.perf_counter() - start
+
+
+def _member_name(filename, index, used):
+    """Archive member name, made unique with the candidate's position when two candidates share a name."""
+    if filename in used:
+        stem, extension = os.path.splitext(filename)
+        filename = f"{stem}_{index + 1}{extension}"
+    used.add(filename)
+    return filename
+
+
+def write_reports_zip(candidates, out, report_formats=("PDF",), report_type="Comprehensive Analysis",
+                      include_charts=True, include_recommendations=True, max_workers=None, on_progress=None):
+    """
+    Render a report per candidate and format in a process pool and write
+    them into a ZIP archive at `out` (a path or a writable binary file),
+    yielding a BatchReportResult per report in completion order.
+
+    `candidates` is an iterable of extracted resume dicts, consumed lazily
+    with a bounded number of reports in flight, and each report is written
+    to the archive as soon as it arrives, so neither the inputs nor the
+    archive sit fully in memory. Reports already in report_cache aren't
+    rendered again. A failed report is yielded with its error, and the
+    archive gets an errors.txt listing the failures. If a worker process
+    dies, the reports in flight at the time fail and the rest go to a
+    fresh pool. `on_progress(done, total)` is called after each report; total
+    is None when `candidates` has no len().
+    """
+    for report_format in report_formats:
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(f"Unknown report format {report_format!r} (expected one of {', '.join(REPORT_FORMATS)})")
+    options = (report_type, include_charts, include_recommendations)
+    total = len(candidates) * len(report_formats) if hasattr(candidates, "__len__") else None
+    jobs = ((i, data, report_format) for i, data in enumerate(candidates) for report_format in report_formats)
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max_workers * 2
+    retry = []  # taken from `jobs` but not accepted by a pool that had just broken
+    used_names = set()
+    errors = []
+    done = 0
+
+    with zipfile.ZipFile(out, "w") as archive:
+        def store(i, data, report_format, filename, content, error, seconds):
+            nonlocal done
+            candidate = str(data.get("Name") or f"candidate {i + 1}")
+            if error is None:
+                filename = _member_name(filename, i, used_names)
+                # PDFs are compressed streams already; deflating them again only costs time
+                compression = zipfile.ZIP_STORED if report_format == "PDF" else zipfile.ZIP_DEFLATED
+                archive.writestr(filename, content, compress_type=compression)
+            else:
+                errors.append(f"{candidate} ({report_format}): {error}")
+            done += 1
+            if on_progress is not None:
+                on_progress(done, total)
+            return BatchReportResult(candidate, filename, error, seconds)
+
+        while True:
+            pending = {}
+            broken = False
+            # spawn, not fork: the Streamlit server process is multi-threaded
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                def fill():
+                    """Submit jobs until max_in_flight are pending, yielding cache hits as they are written."""
+                    nonlocal broken
+                    while not broken and len(pending) < max_in_flight:
+                        job = retry.pop(0) if retry else next(jobs, None)
+                        if job is None:
+                            return
+                        i, data, report_format = job
+                        cached = report_cache.get(report_key(data, report_format, *options))
+                        if cached is not None and isinstance(cached.content, bytes):
+                            yield store(i, data, report_format, cached.filename, cached.content, None, 0.0)
+                            continue
+                        try:
+                            pending[pool.submit(_render_job, data, report_format, *options)] = job
+                        except BrokenProcessPool:
+                            retry.append(job)
+                            broken = True
+
+                yield from fill()
+                while pending:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        i, data, report_format = pending.pop(future)
+                        try:
+                            filename, content, error, seconds = future.result()
+                        except BrokenProcessPool as e:  # a worker died; every report in flight fails with it
+                            broken = True
+                            filename, content, error, seconds = None, None, f"{type(e).__name__}: {e}", 0.0
+                        except Exception as e:
+                            filename, content, error, seconds = None, None, f"{type(e).__name__}: {e}", 0.0
+                        yield store(i, data, report_format, filename, content, error, seconds)
+                    yield from fill()
+            if not broken:
+                break
+
+        if errors:
+            archive.writestr("errors.txt", "\n".join(errors) + "\n")